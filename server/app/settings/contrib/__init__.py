@@ -1,2 +1,4 @@
 from .constance import *
 from .rosetta import *
+from .telegram import *
+from .tmdb import *
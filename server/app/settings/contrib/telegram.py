@@ -0,0 +1,61 @@
+from ..default import env
+
+# Webhook updates are enqueued and processed by a pool of worker threads
+# instead of blocking the request until the update is handled
+TELEGRAM_WEBHOOK_ASYNC = env.bool('TELEGRAM_WEBHOOK_ASYNC', default=False)
+TELEGRAM_WEBHOOK_WORKERS = env.int('TELEGRAM_WEBHOOK_WORKERS', default=4)
+TELEGRAM_WEBHOOK_QUEUE_SIZE = env.int('TELEGRAM_WEBHOOK_QUEUE_SIZE', default=1000)
+# Seconds a process waits on exit for enqueued updates to be processed
+TELEGRAM_WEBHOOK_DRAIN_TIMEOUT = env.float('TELEGRAM_WEBHOOK_DRAIN_TIMEOUT', default=10)
+
+# Max amount of bots dispatchers kept in memory by a process
+TELEGRAM_REGISTRY_SIZE = env.int('TELEGRAM_REGISTRY_SIZE', default=100)
+
+# TMDB search pages fetched concurrently for one page of inline results
+# (Telegram accepts up to 50 results per answer) and seconds to wait for them:
+# answer is sent with pages arrived in time
+TELEGRAM_INLINE_SEARCH_PAGES = env.int('TELEGRAM_INLINE_SEARCH_PAGES', default=2)
+TELEGRAM_INLINE_SEARCH_TIMEOUT = env.float('TELEGRAM_INLINE_SEARCH_TIMEOUT', default=1.5)
+# Inline queries up to this length are answered by titles prefix index,
+# longer ones and index misses are searched
+TELEGRAM_INLINE_PREFIX_LENGTH = env.int('TELEGRAM_INLINE_PREFIX_LENGTH', default=3)
+# Seconds Telegram may cache inline query results on its side
+TELEGRAM_INLINE_CACHE_TIME = env.int('TELEGRAM_INLINE_CACHE_TIME', default=300)
+
+# Conversations states and user data are shared between workers and nodes
+# through the Django cache, so it has to be a cross-process one (Redis)
+TELEGRAM_PERSISTENCE_ENABLED = env.bool('TELEGRAM_PERSISTENCE_ENABLED', default=False)
+TELEGRAM_PERSISTENCE_CACHE_ALIAS = env.str('TELEGRAM_PERSISTENCE_CACHE_ALIAS', default='default')
+TELEGRAM_PERSISTENCE_TIMEOUT = env.int('TELEGRAM_PERSISTENCE_TIMEOUT', default=60 * 60 * 24 * 30)
+# Seconds changed data is buffered before it is written in one batch
+TELEGRAM_PERSISTENCE_FLUSH_INTERVAL = env.float('TELEGRAM_PERSISTENCE_FLUSH_INTERVAL', default=1)
+
+# How movies pages are sent: `messages` - photo and card message per movie,
+# `album` - albums of photos with cards as captions
+TELEGRAM_MOVIES_RENDER_MODE = env.str('TELEGRAM_MOVIES_RENDER_MODE', default='messages')
+
+# Telegram file ids of sent movies images, reused instead of images urls
+TELEGRAM_FILE_ID_CACHE_ALIAS = env.str('TELEGRAM_FILE_ID_CACHE_ALIAS', default='default')
+TELEGRAM_FILE_ID_TIMEOUT = env.int('TELEGRAM_FILE_ID_TIMEOUT', default=60 * 60 * 24 * 30)
+
+# Rendered movies cards, keyed by movie, language and template version
+TELEGRAM_CARDS_CACHE_ALIAS = env.str('TELEGRAM_CARDS_CACHE_ALIAS', default='default')
+TELEGRAM_CARDS_TIMEOUT = env.int('TELEGRAM_CARDS_TIMEOUT', default=60 * 60 * 6)
+
+# Next page of shown movies is fetched in background unless the user was
+# idle for more than TELEGRAM_PREFETCH_IDLE_TIMEOUT seconds before
+TELEGRAM_PREFETCH_ENABLED = env.bool('TELEGRAM_PREFETCH_ENABLED', default=True)
+TELEGRAM_PREFETCH_IDLE_TIMEOUT = env.int('TELEGRAM_PREFETCH_IDLE_TIMEOUT', default=60 * 5)
+
+# Chat users profiles are saved in batches every CHAT_USERS_FLUSH_INTERVAL
+# seconds and only if changed since the last save
+CHAT_USERS_CACHE_ALIAS = env.str('CHAT_USERS_CACHE_ALIAS', default='default')
+CHAT_USERS_FINGERPRINT_TIMEOUT = env.int('CHAT_USERS_FINGERPRINT_TIMEOUT', default=60 * 60 * 24)
+CHAT_USERS_LOCAL_SIZE = env.int('CHAT_USERS_LOCAL_SIZE', default=10000)
+CHAT_USERS_FLUSH_INTERVAL = env.float('CHAT_USERS_FLUSH_INTERVAL', default=5)
+
+# Broadcasts: sending threads, messages per second for all chats (Telegram
+# allows about 30) and recipients loaded from the database per chunk
+BROADCAST_WORKERS = env.int('BROADCAST_WORKERS', default=8)
+BROADCAST_RATE = env.float('BROADCAST_RATE', default=25)
+BROADCAST_CHUNK_SIZE = env.int('BROADCAST_CHUNK_SIZE', default=500)
@@ -0,0 +1,96 @@
+from ..default import env
+
+TMDB_API_URL = env.str('TMDB_API_URL', default='https://api.themoviedb.org/3')
+# Seconds to wait for TMDB to connect and to respond
+TMDB_TIMEOUT = env.float('TMDB_TIMEOUT', default=5)
+# Max amount of keep-alive connections to TMDB kept by a process
+TMDB_POOL_SIZE = env.int('TMDB_POOL_SIZE', default=10)
+TMDB_RETRIES = env.int('TMDB_RETRIES', default=2)
+# Seconds API key set in constance is cached by a process
+TMDB_API_KEY_TTL = env.float('TMDB_API_KEY_TTL', default=60)
+
+# Seconds TMDB responses are fresh, by endpoint. Endpoints without TTL
+# aren't cached
+TMDB_CACHE_TTLS = {
+    'popular': 60 * 60 * 3,
+    'top_rated': 60 * 60 * 12,
+    'upcoming': 60 * 60 * 3,
+    'now_playing': 60 * 60 * 3,
+    'discover': 60 * 60,
+    'search': 60 * 30,
+    # local catalog search hits
+    'catalog_search': 60 * 30,
+    'genres': 60 * 60 * 24,
+}
+# Seconds expired response is still served while it's refreshed in background
+TMDB_CACHE_STALE_TTL = env.int('TMDB_CACHE_STALE_TTL', default=60 * 60)
+# Max amount of responses kept in memory of a process in front of Django cache
+TMDB_CACHE_LOCAL_SIZE = env.int('TMDB_CACHE_LOCAL_SIZE', default=512)
+TMDB_CACHE_ALIAS = env.str('TMDB_CACHE_ALIAS', default='default')
+# Identical concurrent TMDB requests of a process share one call. With
+# TMDB_SINGLE_FLIGHT_SHARED processes also wait for each other through a lock
+# in TMDB_CACHE_ALIAS cache held for up to TMDB_SINGLE_FLIGHT_LOCK_TIMEOUT seconds
+TMDB_SINGLE_FLIGHT_SHARED = env.bool('TMDB_SINGLE_FLIGHT_SHARED', default=False)
+TMDB_SINGLE_FLIGHT_LOCK_TIMEOUT = env.int('TMDB_SINGLE_FLIGHT_LOCK_TIMEOUT', default=10)
+
+# Threads used by a process to fetch several TMDB pages concurrently
+TMDB_FETCH_WORKERS = env.int('TMDB_FETCH_WORKERS', default=8)
+# Max amount of pages prefetched by a process at once, extra ones are dropped
+TMDB_PREFETCH_MAX_CONCURRENT = env.int('TMDB_PREFETCH_MAX_CONCURRENT', default=4)
+
+# Local movies catalog is filled from TMDB responses. Movie details synced
+# within TMDB_CATALOG_TTL seconds are read from it without calling TMDB
+TMDB_CATALOG_ENABLED = env.bool('TMDB_CATALOG_ENABLED', default=True)
+TMDB_CATALOG_TTL = env.int('TMDB_CATALOG_TTL', default=60 * 60 * 24)
+# Threads used by a process to save TMDB responses to the catalog
+TMDB_CATALOG_WRITE_WORKERS = env.int('TMDB_CATALOG_WRITE_WORKERS', default=1)
+# Seconds saved lists pages are kept as outdated fallback, older ones are
+# deleted by `sync_tmdb_changes`
+TMDB_CATALOG_PAGES_MAX_AGE = env.int('TMDB_CATALOG_PAGES_MAX_AGE', default=60 * 60 * 24 * 7)
+# Searches are answered from the catalog search index when it finds at least
+# TMDB_LOCAL_SEARCH_MIN_RESULTS movies, otherwise TMDB is asked
+TMDB_LOCAL_SEARCH_MIN_RESULTS = env.int('TMDB_LOCAL_SEARCH_MIN_RESULTS', default=5)
+TMDB_LOCAL_SEARCH_LIMIT = env.int('TMDB_LOCAL_SEARCH_LIMIT', default=40)
+# Most popular catalog titles per language kept in the in-process prefix
+# index and seconds between merging recently synced titles into it
+TMDB_PREFIX_INDEX_SIZE = env.int('TMDB_PREFIX_INDEX_SIZE', default=20000)
+TMDB_PREFIX_INDEX_REFRESH_INTERVAL = env.float('TMDB_PREFIX_INDEX_REFRESH_INTERVAL', default=60 * 10)
+# Seconds between reloading in-process genres names of all languages
+TMDB_GENRES_REFRESH_INTERVAL = env.float('TMDB_GENRES_REFRESH_INTERVAL', default=60 * 60 * 6)
+# Seconds before TMDB is asked again for genres it failed to return
+TMDB_GENRES_RETRY_INTERVAL = env.float('TMDB_GENRES_RETRY_INTERVAL', default=60)
+
+# Movies lists ranking by list type over the `default` one: filters, votes of
+# the Bayesian prior pulling ratings of little voted movies to the mean,
+# shares of popularity and recency in the score and days recency halves in
+TMDB_RANKING_PROFILES = {
+    'default': {
+        'min_vote_average': 5,
+        'min_vote_count': 50,
+        'require_backdrop': True,
+        'require_overview': True,
+        'prior_votes': 500,
+        'popularity_weight': 0.2,
+        'recency_weight': 0.1,
+        'recency_half_life': 365 * 2,
+    },
+    'top_rated': {
+        'popularity_weight': 0.1,
+        'recency_weight': 0,
+    },
+    # * upcoming movies have almost no votes yet
+    'upcoming': {
+        'min_vote_average': -1,
+        'min_vote_count': -1,
+        'popularity_weight': 0.5,
+        'recency_weight': 0.3,
+        'recency_half_life': 90,
+    },
+    'now_playing': {
+        'recency_weight': 0.3,
+        'recency_half_life': 180,
+    },
+    'search': {
+        'popularity_weight': 0.4,
+    },
+}
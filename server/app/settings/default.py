@@ -81,9 +81,12 @@ TEMPLATES = [
             'environment': 'shared.env.jinja2.environment',
             'match_extension': '.jinja',
             'newstyle_gettext': True,
-            'auto_reload': True,
+            # * templates are compiled once per process and kept in memory,
+            # * in debug mode they are recompiled once changed
+            'auto_reload': DEBUG,
+            'cache_size': env.int('JINJA_CACHE_SIZE', default=400),
             'undefined': jinja2.Undefined,
-            'debug': True,
+            'debug': DEBUG,
 
             'filters': {},
 
@@ -102,7 +105,7 @@ TEMPLATES = [
             'extensions': DEFAULT_EXTENSIONS,
 
             "bytecode_cache": {
-                "name": "default",
+                "name": env.str('JINJA_BYTECODE_CACHE_ALIAS', default='default'),
                 "backend": "django_jinja.cache.BytecodeCache",
                 "enabled": True,
             },
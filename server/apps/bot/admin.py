@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Bot, ChatUser
+from .models import Bot, ChatUser, Movie, MovieTranslation
 from .services.webhook import set_webhook
 
 
@@ -25,3 +25,27 @@ class ChatUserAdmin(admin.ModelAdmin):
         'last_name',
         'language_code'
     ]
+
+
+class MovieTranslationInline(admin.TabularInline):
+    model = MovieTranslation
+    extra = 0
+
+
+@admin.register(Movie)
+class MovieAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'original_title',
+        'release_date',
+        'vote_average',
+        'vote_count',
+        'synced_at'
+    ]
+    search_fields = [
+        'original_title',
+        'translations__title'
+    ]
+    inlines = [
+        MovieTranslationInline
+    ]
@@ -6,13 +6,6 @@ class BotConfig(AppConfig):
     name = 'apps.bot'
 
     def ready(self):
-        print('INIT BOTS:')
-        from .models import Bot
-        from .registry import registry
-        from .services import get_dispatcher
-
-        for bot in Bot.objects.all():
-            dispatcher = get_dispatcher(token=bot.token)
-            registry.add_entry(dispatcher)
-
-        print('INIT REGISTRY:', registry)
+        # Load this module so django will register an events.
+        # Dispatchers are built lazily by the registry on the first webhook hit.
+        from . import receivers
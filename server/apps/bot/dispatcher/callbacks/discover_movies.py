@@ -18,7 +18,9 @@ from apps.bot.dispatcher.services import (
     display_search_params,
     build_search_params,
     render_movies,
-    get_last_movie_keyboard
+    get_last_movie_keyboard,
+    set_current_page,
+    prefetch_next_page
 )
 from apps.bot.tmdb import get_cached_movies_genres, TMDBWrapper
 
@@ -212,17 +214,13 @@ def back_or_clear_show_data_callback(update: 'Update', context: 'CallbackContext
 def discover_movies_callback(update: 'Update', context: 'CallbackContext'):
     print('Discover movies...')
     update.callback_query.answer()
-    movies = (
-        TMDBWrapper(
-            language=context.user_data.get('language')
-        )
-        .discover_movies(
-            params=build_search_params(
-                update=update,
-                context=context,
-            )
-        )
+    tmdb = TMDBWrapper(language=context.user_data.get('language'))
+    params = build_search_params(
+        update=update,
+        context=context,
     )
+    movies = tmdb.discover_movies(params=params)
+    set_current_page(context=context, movies=movies)
     # + INFO
     # When replying to a text message (from a MessageHandler) is fine
     # to use update.message.reply_text, but in your case the incoming message
@@ -231,5 +229,13 @@ def discover_movies_callback(update: 'Update', context: 'CallbackContext'):
         context=context,
         movies=movies,
         message=update.callback_query.message,
-        reply_markup=get_last_movie_keyboard(movies=movies)
+        reply_markup=get_last_movie_keyboard(movies=movies, context=context)
+    )
+    prefetch_next_page(
+        context=context,
+        movies=movies,
+        key=f'discover:{sorted(params.items())}',
+        fetch=lambda next_page: tmdb.discover_movies(
+            params={**params, 'page': next_page}
+        )
     )
@@ -13,6 +13,7 @@ from apps.bot.dispatcher.consts import (
     CONSTS,
     STATE_CHOICES
 )
+from apps.bot.dispatcher.services import touch_user_activity
 
 if TYPE_CHECKING:
     from telegram import Update
@@ -35,6 +36,7 @@ def start(update: 'Update', context: 'CallbackContext'):
         context=context
     )
     context.user_data['language'] = user.language_code
+    touch_user_activity(context=context)
     print('User:', user)
     text = str(_(
         "Lets find a movie for you..."
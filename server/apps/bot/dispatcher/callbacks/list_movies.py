@@ -7,8 +7,10 @@ from apps.bot.dispatcher.consts import (
 )
 from apps.bot.dispatcher.services import (
     get_current_page,
+    set_current_page,
     render_movies,
-    get_last_movie_keyboard
+    get_last_movie_keyboard,
+    prefetch_next_page
 )
 from apps.bot.tmdb import TMDBWrapper
 
@@ -25,17 +27,14 @@ __all__ = (
 def list_movies_callback(update: 'Update', context: 'CallbackContext'):
     print('List movies...')
     update.callback_query.answer()
-    page = get_current_page()
     list_method = context.user_data.get(CONSTS.list_method)
     callback_data = update.callback_query.data
 
     if callback_data == ACTION_CHOICES.next_movies:
-        page += 1
+        page = get_current_page(context=context) + 1
     else:
-        # new list method
-        if list_method != callback_data:
-            page = 1
-
+        # list method is chosen from start, begin from the first page
+        page = 1
         list_method = callback_data
 
     print('List method:', list_method)
@@ -45,12 +44,19 @@ def list_movies_callback(update: 'Update', context: 'CallbackContext'):
     method = getattr(tmdb, list_method)
 
     movies = method(page=page)
+    set_current_page(context=context, movies=movies)
 
     render_movies(
         context=context,
         movies=movies,
         message=update.callback_query.message,
-        reply_markup=get_last_movie_keyboard(movies=movies)
+        reply_markup=get_last_movie_keyboard(movies=movies, context=context)
+    )
+    prefetch_next_page(
+        context=context,
+        movies=movies,
+        key=list_method,
+        fetch=lambda next_page: method(page=next_page)
     )
 
     return STATE_CHOICES.listing_movies
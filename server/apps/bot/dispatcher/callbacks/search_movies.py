@@ -5,10 +5,12 @@ from django.utils.translation import ugettext_lazy as _
 from apps.bot.dispatcher.consts import CONSTS, STATE_CHOICES
 from apps.bot.dispatcher.services import (
     get_current_page,
+    set_current_page,
     render_movies,
-    get_last_movie_keyboard
+    get_last_movie_keyboard,
+    prefetch_next_page
 )
-from apps.bot.tmdb import TMDBWrapper
+from apps.bot.tmdb import CATALOG_PAGE, TMDBWrapper
 
 if TYPE_CHECKING:
     from telegram import Update
@@ -45,11 +47,11 @@ def display_movies_callback(update: 'Update', context: 'CallbackContext'):
     print('Display movies...')
     user_data = context.user_data
     search_keyword = user_data.get(CONSTS.search_keyword)
-    page = get_current_page()
+    page = get_current_page(context=context)
     message = update.message
 
     if update.message:
-        page = 1
+        page = CATALOG_PAGE
         search_keyword = update.message.text
         user_data[CONSTS.search_keyword] = search_keyword
 
@@ -60,20 +62,26 @@ def display_movies_callback(update: 'Update', context: 'CallbackContext'):
 
     print('Search keywords:', search_keyword)
     print('Page:', page)
-    movies = (
-        TMDBWrapper(
-            language=context.user_data.get('language')
-        )
-        .search_movies(
-            query=search_keyword,
-            page=page
-        )
+    tmdb = TMDBWrapper(language=context.user_data.get('language'))
+    movies = tmdb.search_movies(
+        query=search_keyword,
+        page=page
     )
+    set_current_page(context=context, movies=movies)
     render_movies(
         context=context,
         movies=movies,
         message=message,
-        reply_markup=get_last_movie_keyboard(movies=movies)
+        reply_markup=get_last_movie_keyboard(movies=movies, context=context)
+    )
+    prefetch_next_page(
+        context=context,
+        movies=movies,
+        key=f'search:{search_keyword}',
+        fetch=lambda next_page: tmdb.search_movies_page(
+            query=search_keyword,
+            page=next_page
+        )
     )
 
     return STATE_CHOICES.displaying_movies
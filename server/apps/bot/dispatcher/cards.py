@@ -0,0 +1,103 @@
+import hashlib
+from typing import Callable, Dict, List, Tuple, TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template import engines
+from django.utils.functional import cached_property
+from django.utils.translation import get_language
+
+if TYPE_CHECKING:
+    from ..tmdb import MovieRecord
+
+__all__ = (
+    'CardsCache',
+    'cards',
+)
+
+# (card kind, movie id)
+CardKey = Tuple[str, int]
+
+
+class CardsCache:
+    """
+    Rendered movies cards.
+
+    Card depends on the movie, the language of its data, the active
+    translation of labels and the template, so all of them are in the key:
+    a changed template gets new keys instead of stale cards. Cards of a page
+    are read with one `get_many` and missing ones are written with one
+    `set_many`.
+    """
+    def __init__(
+            self,
+            *,
+            cache_alias: str = 'default',
+            timeout: int = None,
+            templates: Tuple[str, ...] = ()
+    ):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.templates = templates
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @cached_property
+    def version(self) -> str:
+        digest = hashlib.md5()
+        loader = engines['jinja2'].env.loader
+
+        for template_name in self.templates:
+            source, _, _ = loader.get_source(engines['jinja2'].env, template_name)
+            digest.update(source.encode())
+
+        return digest.hexdigest()[:8]
+
+    def get_key(self, card: 'CardKey', language: str = None) -> str:
+        kind, movie_id = card
+        return (
+            f'movie_card:{self.version}:{get_language()}:'
+            f'{language or ""}:{kind}:{movie_id}'
+        )
+
+    def get_or_render(
+            self,
+            *,
+            movies: List['MovieRecord'],
+            renders: Dict[str, Callable[['MovieRecord'], str]],
+            language: str = None
+    ) -> Dict['CardKey', str]:
+        """
+        Returns cards of every kind of `renders` for all movies,
+        rendering only missing ones.
+        """
+        keys = {
+            self.get_key((kind, movie.id), language): (kind, movie)
+            for movie in movies
+            for kind in renders
+        }
+        stored = self.cache.get_many(list(keys))
+        rendered = {}
+        result = {}
+
+        for key, (kind, movie) in keys.items():
+            card = stored.get(key)
+
+            if card is None:
+                card = rendered[key] = renders[kind](movie)
+
+            result[kind, movie.id] = card
+
+        if rendered:
+            self.cache.set_many(rendered, timeout=self.timeout)
+
+        return result
+
+
+cards = CardsCache(
+    cache_alias=settings.TELEGRAM_CARDS_CACHE_ALIAS,
+    timeout=settings.TELEGRAM_CARDS_TIMEOUT,
+    templates=('movies/card.jinja',),
+)
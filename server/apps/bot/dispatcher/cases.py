@@ -1,6 +1,10 @@
 from typing import TYPE_CHECKING
 
-from ..services.user import parse_user, save_user, activate_user_language
+from ..services.user import (
+    parse_user,
+    chat_users_buffer,
+    activate_user_language
+)
 
 if TYPE_CHECKING:
     from telegram import Update
@@ -22,7 +26,7 @@ def save_user_and_activate_user_language(
         update=update,
         context=context
     )
-    save_user(user_entity=user)
+    chat_users_buffer.save(user)
     activate_user_language(user=user)
 
     return user
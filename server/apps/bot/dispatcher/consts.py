@@ -10,8 +10,11 @@ __all__ = (
     'STATE_CHOICES',
     'CONSTS',
     'YEARS_CHOICES',
+    'RENDER_MODE_CHOICES',
     'END',
-    'BACK_BUTTON'
+    'BACK_BUTTON',
+    'CAPTION_MAX_LENGTH',
+    'MEDIA_GROUP_MAX_SIZE'
 )
 
 
@@ -48,8 +51,10 @@ CONSTS = Choices(
     ('genres', 'Genre'),
     ('years', 'Years'),
     ('page', 'Page'),
+    ('total_pages', 'Total pages'),
     ('search_keyword', 'Search keyword'),
-    ('list_method', 'List method')
+    ('list_method', 'List method'),
+    ('last_active_at', 'Last active at')
 )
 
 YEARS_CHOICES = (
@@ -62,8 +67,17 @@ YEARS_CHOICES = (
     (f'2016-{now().year}', f'2016-{now().year}'),
 )
 
+RENDER_MODE_CHOICES = Choices(
+    ('messages', 'Photo and card message per movie'),
+    ('album', 'Albums with cards as captions'),
+)
+
 END = ConversationHandler.END
 
+# Telegram limits
+CAPTION_MAX_LENGTH = 1024
+MEDIA_GROUP_MAX_SIZE = 10
+
 BACK_BUTTON = [
     InlineKeyboardButton(
         text=str(_('Back')),
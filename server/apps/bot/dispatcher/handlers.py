@@ -39,11 +39,13 @@ __all__ = (
 )
 
 
-def get_select_action_handlers():
+def get_select_action_handlers(persistent: bool = False):
     selection_handlers = [
         # ? nested conversation handler to discover movies by genres and years
         # * handles `discover_movies` callback from start
         ConversationHandler(
+            name='discover_movies',
+            persistent=persistent,
             entry_points=[
                 CallbackQueryHandler(
                     discovering_movies_callback,
@@ -144,14 +146,18 @@ def get_select_action_handlers():
     return selection_handlers
 
 
-def get_movie_handler() -> 'ConversationHandler':
+def get_movie_handler(persistent: bool = False) -> 'ConversationHandler':
     conversation_handler = ConversationHandler(
+        name='movies',
+        persistent=persistent,
         entry_points=[
             CommandHandler('movies', start)
         ],
         states={
             # * handle `selecting_action`
-            STATE_CHOICES.selecting_action: get_select_action_handlers(),
+            STATE_CHOICES.selecting_action: get_select_action_handlers(
+                persistent=persistent
+            ),
 
             # * handle `searching_movies`
             STATE_CHOICES.searching_movies: [
@@ -1,16 +1,17 @@
 from telegram import InlineQueryResultArticle, ParseMode, InputTextMessageContent, Update
 from telegram.ext import InlineQueryHandler, CallbackContext
 
-from django.utils.translation import ugettext_lazy as _
+from django.conf import settings
 
+from .cards import cards
 from .cases import save_user_and_activate_user_language
 from .services import (
     get_movie_url,
     get_movie_poster_url,
     render_movie_html,
-    get_movies_genres
+    render_movie_description
 )
-from ..tmdb import TMDBWrapper, get_cached_movies_genres
+from ..tmdb import CATALOG_PAGE, TMDBWrapper, get_cached_movies_genres
 
 __all__ = (
     'search_movies',
@@ -25,15 +26,20 @@ def search_movies(update: 'Update', context: 'CallbackContext') -> None:
         context=context
     )
     search_keyword = update.inline_query.query
+    offset = update.inline_query.offset
+    # * offset is the first search page of the requested inline results page,
+    # * a search starts from the catalog page
+    first_page = int(offset) if offset.isdigit() else CATALOG_PAGE
 
     print('Search keyword:', search_keyword)
+    print('Offset:', offset)
 
     if search_keyword == "":
         return
 
     genres_map = (
         get_cached_movies_genres(
-            language=context.user_data.get('language')
+            language=user.language_code
         )
     )
 
@@ -41,43 +47,69 @@ def search_movies(update: 'Update', context: 'CallbackContext') -> None:
         language=user.language_code
     )
 
-    movies = []
+    page = None
 
-    for page in range(1, 5):
-        movies.extend(
-            wrapper
-            .search_movies(
-                query=search_keyword,
-                page=page
-            )
+    # * short queries are prefixes being typed, they're answered by the index
+    if first_page == CATALOG_PAGE and len(search_keyword) <= settings.TELEGRAM_INLINE_PREFIX_LENGTH:
+        page = wrapper.complete_movies(query=search_keyword)
+
+    if not page:
+        page = wrapper.search_movies_pages(
+            query=search_keyword,
+            pages=range(
+                first_page,
+                first_page + settings.TELEGRAM_INLINE_SEARCH_PAGES
+            ),
+            timeout=settings.TELEGRAM_INLINE_SEARCH_TIMEOUT
         )
 
-    movies = sorted(set(movies), key=lambda x: x.vote_average)
+    # * movies are ranked, the best first
+    movies = list(page)
+    texts = cards.get_or_render(
+        movies=movies,
+        renders={
+            'html_image': lambda movie: render_movie_html(
+                movie=movie,
+                context=context,
+                genres_map=genres_map,
+                with_image=True
+            ),
+            'description': lambda movie: render_movie_description(
+                movie=movie,
+                context=context,
+                genres_map=genres_map
+            )
+        },
+        language=user.language_code
+    )
+    # empty offset tells Telegram there are no more results,
+    # missing pages are asked again from the first of them
+    next_offset = str(page.page + 1) if page.has_next else ''
 
-    update.inline_query.answer([
+    results = [
         InlineQueryResultArticle(
             id=str(movie.id),
             title=movie.title,
             input_message_content=InputTextMessageContent(
-                render_movie_html(
-                    movie=movie,
-                    context=context,
-                    with_image=True
-                ),
+                texts['html_image', movie.id],
                 disable_web_page_preview=False,
                 parse_mode=ParseMode.HTML
             ),
             url=get_movie_url(movie=movie),
-            description=(
-                f"{_('Rating:')} "
-                f"{movie.vote_average}/{movie.vote_count} "
-                f"({get_movies_genres(movie=movie, context=context, genres_map=genres_map, limit=2)})\n"
-                f"{movie.overview[:500]}"
-            ),
+            description=texts['description', movie.id],
             thumb_url=get_movie_poster_url(movie=movie, width=92),
         )
         for movie in movies
-    ])
+    ]
+
+    update.inline_query.answer(
+        results,
+        next_offset=next_offset,
+        # incomplete results are not cached by Telegram
+        cache_time=settings.TELEGRAM_INLINE_CACHE_TIME if page.is_complete else 0,
+        # results depend on user language
+        is_personal=True
+    )
 
 
 def get_inline_handler():
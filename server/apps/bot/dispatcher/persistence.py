@@ -0,0 +1,217 @@
+import atexit
+import copy
+import threading
+from collections import defaultdict
+from typing import DefaultDict, Dict, Optional, Set, Tuple, TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+
+from telegram.ext import BasePersistence
+
+from ..utils import PeriodicTask
+
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import Dispatcher
+
+__all__ = (
+    'DjangoCachePersistence',
+    'PersistenceFlusher',
+    'flusher',
+)
+
+
+class PersistenceFlusher:
+    """
+    Flushes buffered writes of every persistence of the process
+    in one thread and once more on exit.
+
+    Persistence is held only while it has writes to flush, so persistences
+    of evicted dispatchers are flushed and then released.
+    """
+    def __init__(self, *, interval: float):
+        self._pending: Set['DjangoCachePersistence'] = set()
+        self._lock = threading.Lock()
+        self._task = PeriodicTask(self.flush, interval=interval, name='persistence-flush')
+        atexit.register(self.flush)
+
+    def add(self, persistence: 'DjangoCachePersistence'):
+        with self._lock:
+            self._pending.add(persistence)
+
+        self._task.start()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+
+        for persistence in pending:
+            try:
+                persistence.flush()
+            except Exception as e:
+                print(f"Can't flush persistence. Reason: {e}")
+
+
+class DjangoCachePersistence(BasePersistence):
+    """
+    Stores conversations states and `user_data` in the Django cache
+    (Redis in production), so every worker and node sees the same state.
+
+    `python-telegram-bot` loads persisted data only once on dispatcher setup,
+    so data of a user is re-read by `refresh` right before each of their
+    updates is processed: one `get_many` for all keys of the update.
+    Writes are buffered: only values changed since the last write are
+    collected as snapshots and written with one `set_many` by the process
+    `flusher` every `TELEGRAM_PERSISTENCE_FLUSH_INTERVAL` seconds.
+    """
+    def __init__(
+            self,
+            *,
+            cache_alias: str = 'default',
+            timeout: int = None
+    ):
+        super().__init__(
+            store_user_data=True,
+            store_chat_data=False,
+            store_bot_data=False
+        )
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.conversations: Dict[str, Dict[Tuple, object]] = {}
+        self._persisted: Dict[str, object] = {}
+        self._dirty: Dict[str, object] = {}
+        self._deleted: Set[str] = set()
+        self._flushing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def prefix(self) -> str:
+        # * `bot.id` would call `getMe`, while token starts with the bot id
+        bot_id = self.bot.token.split(':')[0]
+        return f'telegram:{bot_id}'
+
+    def get_user_data_key(self, user_id: int) -> str:
+        return f'{self.prefix}:user_data:{user_id}'
+
+    def get_conversation_key(self, name: str, key: Tuple) -> str:
+        return f'{self.prefix}:conversation:{name}:{":".join(map(str, key))}'
+
+    def get_user_data(self) -> DefaultDict[int, Dict]:
+        # * data is loaded lazily by `refresh`
+        return defaultdict(dict)
+
+    def get_chat_data(self) -> DefaultDict[int, Dict]:
+        return defaultdict(dict)
+
+    def get_bot_data(self) -> Dict:
+        return {}
+
+    def get_conversations(self, name: str) -> Dict:
+        return self.conversations.setdefault(name, {})
+
+    def update_user_data(self, user_id: int, data: Dict):
+        self._write(self.get_user_data_key(user_id), data)
+
+    def update_chat_data(self, chat_id: int, data: Dict):
+        pass
+
+    def update_bot_data(self, data: Dict):
+        pass
+
+    def update_conversation(self, name: str, key: Tuple, new_state: Optional[object]):
+        # * states of `run_async` handlers are promises, those can't be shared
+        if isinstance(new_state, tuple):
+            return
+
+        self._write(self.get_conversation_key(name, key), new_state)
+
+    def refresh(self, *, dispatcher: 'Dispatcher', update: 'Update'):
+        """
+        Loads stored data of the update user and chat.
+        """
+        user = update.effective_user
+        chat = update.effective_chat
+        keys: Dict[str, Tuple] = {}
+
+        if user is not None:
+            keys[self.get_user_data_key(user.id)] = ('user_data', user.id)
+
+        if chat is not None:
+            key = (chat.id, user.id) if user is not None else (chat.id,)
+
+            for name in self.conversations:
+                keys[self.get_conversation_key(name, key)] = ('conversation', name, key)
+
+        if not keys:
+            return
+
+        stored = self.cache.get_many(list(keys))
+
+        with self._lock:
+            for cache_key, target in keys.items():
+                # * local changes aren't flushed yet, they are the newest
+                if (
+                        cache_key in self._dirty
+                        or cache_key in self._deleted
+                        or cache_key in self._flushing
+                ):
+                    continue
+
+                value = stored.get(cache_key)
+
+                if target[0] == 'user_data':
+                    if value is not None:
+                        self._persisted[cache_key] = copy.deepcopy(value)
+                        dispatcher.user_data[target[1]] = self.insert_bot(value)
+                elif value is None:
+                    self.conversations[target[1]].pop(target[2], None)
+                    self._persisted.pop(cache_key, None)
+                else:
+                    self.conversations[target[1]][target[2]] = value
+                    self._persisted[cache_key] = value
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            deleted, self._deleted = self._deleted, set()
+            self._flushing = set(dirty) | deleted
+
+        try:
+            if dirty:
+                self.cache.set_many(dirty, timeout=self.timeout)
+
+            if deleted:
+                self.cache.delete_many(list(deleted))
+        finally:
+            with self._lock:
+                self._flushing = set()
+
+    def _write(self, cache_key: str, value: Optional[object]):
+        # * handlers keep mutating the live data, so a snapshot is compared
+        # * with and written, not the data itself
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            if self._persisted.get(cache_key) == value:
+                return
+
+            if value is None:
+                self._persisted.pop(cache_key, None)
+                self._dirty.pop(cache_key, None)
+                self._deleted.add(cache_key)
+            else:
+                self._persisted[cache_key] = value
+                self._deleted.discard(cache_key)
+                self._dirty[cache_key] = value
+
+        flusher.add(self)
+
+
+flusher = PersistenceFlusher(
+    interval=settings.TELEGRAM_PERSISTENCE_FLUSH_INTERVAL,
+)
@@ -0,0 +1,161 @@
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import caches
+
+from telegram import InputMediaPhoto, ParseMode
+from telegram.error import BadRequest
+
+if TYPE_CHECKING:
+    from telegram import Bot, Message
+
+__all__ = (
+    'FileIdCache',
+    'file_ids',
+    'send_movie_photo',
+    'send_movie_photos_group'
+)
+
+# (movie id, image kind, image size)
+ImageKey = Tuple[int, str, str]
+
+
+class FileIdCache:
+    """
+    Telegram `file_id` of images already uploaded by a bot.
+
+    Telegram downloads an image by URL only for the first send, later sends
+    reuse its `file_id`. Ids are valid only for the bot which got them,
+    so they are stored per bot. Entries expire after `timeout` seconds
+    and are dropped once Telegram rejects them.
+    """
+    def __init__(self, *, cache_alias: str = 'default', timeout: int = None):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_key(self, bot: 'Bot', image: 'ImageKey') -> str:
+        bot_id = bot.token.split(':')[0]
+        movie_id, kind, size = image
+        return f'telegram:{bot_id}:file_id:{kind}:{size}:{movie_id}'
+
+    def get(self, bot: 'Bot', image: 'ImageKey') -> Optional[str]:
+        return self.cache.get(self.get_key(bot, image))
+
+    def get_many(self, bot: 'Bot', images: List['ImageKey']) -> Dict['ImageKey', str]:
+        keys = {self.get_key(bot, image): image for image in images}
+        stored = self.cache.get_many(list(keys))
+        return {keys[key]: file_id for key, file_id in stored.items()}
+
+    def set(self, bot: 'Bot', image: 'ImageKey', file_id: str):
+        self.cache.set(self.get_key(bot, image), file_id, timeout=self.timeout)
+
+    def set_many(self, bot: 'Bot', file_ids: Dict['ImageKey', str]):
+        self.cache.set_many(
+            {
+                self.get_key(bot, image): file_id
+                for image, file_id in file_ids.items()
+            },
+            timeout=self.timeout
+        )
+
+    def delete_many(self, bot: 'Bot', images: List['ImageKey']):
+        self.cache.delete_many([self.get_key(bot, image) for image in images])
+
+
+file_ids = FileIdCache(
+    cache_alias=settings.TELEGRAM_FILE_ID_CACHE_ALIAS,
+    timeout=settings.TELEGRAM_FILE_ID_TIMEOUT,
+)
+
+
+def get_photo_file_id(message: 'Message') -> Optional[str]:
+    if not message.photo:
+        return None
+
+    # * sizes are ordered from the smallest one
+    return message.photo[-1].file_id
+
+
+def send_movie_photo(
+        *,
+        bot: 'Bot',
+        chat_id: int,
+        image: 'ImageKey',
+        url: str,
+        caption: str = None
+) -> 'Message':
+    file_id = file_ids.get(bot, image)
+
+    if file_id is not None:
+        try:
+            return bot.send_photo(
+                chat_id,
+                photo=file_id,
+                caption=caption,
+                parse_mode=ParseMode.HTML
+            )
+        except BadRequest as e:
+            print(f"Can't send photo by file id {file_id}. Reason: {e}")
+            file_ids.delete_many(bot, [image])
+
+    message = bot.send_photo(
+        chat_id,
+        photo=url,
+        caption=caption,
+        parse_mode=ParseMode.HTML
+    )
+    file_id = get_photo_file_id(message)
+
+    if file_id is not None:
+        file_ids.set(bot, image, file_id)
+
+    return message
+
+
+def send_movie_photos_group(
+        *,
+        bot: 'Bot',
+        chat_id: int,
+        photos: List[Tuple['ImageKey', str, str]]
+) -> List['Message']:
+    """
+    Sends album of (image, url, caption) photos, reusing known file ids.
+    """
+    images = [image for image, _, _ in photos]
+    known = file_ids.get_many(bot, images)
+
+    def get_media(use_known: bool) -> List['InputMediaPhoto']:
+        return [
+            InputMediaPhoto(
+                media=known.get(image, url) if use_known else url,
+                caption=caption,
+                parse_mode=ParseMode.HTML
+            )
+            for image, url, caption in photos
+        ]
+
+    try:
+        messages = bot.send_media_group(chat_id, media=get_media(use_known=True))
+    except BadRequest as e:
+        if not known:
+            raise
+
+        print(f"Can't send album by file ids. Reason: {e}")
+        file_ids.delete_many(bot, list(known))
+        known = {}
+        messages = bot.send_media_group(chat_id, media=get_media(use_known=False))
+
+    received = {
+        image: get_photo_file_id(message)
+        for image, message in zip(images, messages)
+        if image not in known and get_photo_file_id(message)
+    }
+
+    if received:
+        file_ids.set_many(bot, received)
+
+    return messages
@@ -1,28 +1,51 @@
+import re
+import time
 from itertools import chain
-from os import environ
-from typing import List, TYPE_CHECKING, Dict
+from typing import Callable, List, TYPE_CHECKING, Dict, Tuple
 
-from django.template.loader import render_to_string
+from django.conf import settings
 from django.utils.datastructures import MultiValueDict
 from django.utils.translation import ugettext_lazy as _
 
-from telegram import ParseMode, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import (
+    ParseMode,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup
+)
+
+from shared.env.jinja2 import render_template
 
-from .consts import ACTION_CHOICES, BACK_BUTTON, CONSTS, END
+from .consts import (
+    ACTION_CHOICES,
+    BACK_BUTTON,
+    CAPTION_MAX_LENGTH,
+    CONSTS,
+    END,
+    MEDIA_GROUP_MAX_SIZE,
+    RENDER_MODE_CHOICES
+)
+from .cards import cards
+from .photos import send_movie_photo, send_movie_photos_group
+from ..entities import RenderStats
 from ..utils import lookahead
 from ..tmdb import get_cached_movies_genres
+from ..tmdb.prefetch import prefetcher
 
 if TYPE_CHECKING:
     from telegram import Message, Update
     from telegram.ext import CallbackContext
-    from tmdbv3api import Movie
+
+    from ..tmdb import MovieRecord, MoviesPage
 
 __all__ = (
+    'get_movie_backdrop',
     'get_movie_backdrop_url',
     'get_movie_poster_url',
     'get_movie_url',
     'get_movies_genres',
     'render_movie_html',
+    'render_movie_caption',
+    'render_movie_description',
     'render_movies',
     'get_last_movie_keyboard',
     'set_search_params',
@@ -30,13 +53,16 @@ __all__ = (
     'display_search_params',
     'get_discovering_movies_callback_text',
     'get_current_page',
-    'movies_search_has_more_pages'
+    'set_current_page',
+    'movies_search_has_more_pages',
+    'touch_user_activity',
+    'prefetch_next_page'
 )
 
 
 def get_movie_backdrop_url(
         *,
-        movie: 'Movie',
+        movie: 'MovieRecord',
         width: int = 600,
         height: int = 900
 ) -> str:
@@ -47,9 +73,23 @@ def get_movie_backdrop_url(
     )
 
 
+def get_movie_backdrop(
+        *,
+        movie: 'MovieRecord',
+        width: int = 600,
+        height: int = 900
+) -> Tuple[Tuple[int, str, str], str]:
+    """
+    Returns key of the backdrop image for the file ids cache and its url.
+    """
+    image = (movie.id, 'backdrop', f'w{width}_and_h{height}')
+    url = get_movie_backdrop_url(movie=movie, width=width, height=height)
+    return image, url
+
+
 def get_movie_poster_url(
         *,
-        movie: 'Movie',
+        movie: 'MovieRecord',
         width: int = 92,
 ) -> str:
     return (
@@ -59,7 +99,7 @@ def get_movie_poster_url(
     )
 
 
-def get_movie_url(*, movie: 'Movie') -> str:
+def get_movie_url(*, movie: 'MovieRecord') -> str:
     return (
         f'https://www.themoviedb.org/movie/'
         f'{movie.id}'
@@ -68,7 +108,7 @@ def get_movie_url(*, movie: 'Movie') -> str:
 
 def get_movies_genres(
         *,
-        movie: 'Movie',
+        movie: 'MovieRecord',
         context: 'CallbackContext',
         genres_map: Dict = None,
         limit: int = None
@@ -81,9 +121,10 @@ def get_movies_genres(
         )
 
     genres = [
-        genres_map[genre_id]
+        genres_map.get(genre_id)
         for genre_id in movie.genre_ids
     ]
+    genres = [genre for genre in genres if genre]
 
     if limit:
         genres = genres[:limit]
@@ -93,16 +134,17 @@ def get_movies_genres(
 
 def render_movie_html(
         *,
-        movie: 'Movie',
+        movie: 'MovieRecord',
         context: 'CallbackContext',
         genres_map: Dict = None,
-        with_image: bool = False
+        with_image: bool = False,
+        description_length: int = 500
 ) -> str:
     context = {
         'link': get_movie_url(movie=movie),
         'title': movie.title,
         'rating': movie.vote_average,
-        'description': movie.overview[:500],
+        'description': movie.overview[:description_length],
         'release_date': movie.release_date,
         'vote_count': movie.vote_count,
         'genres': get_movies_genres(
@@ -115,61 +157,282 @@ def render_movie_html(
     if with_image:
         context['image'] = get_movie_backdrop_url(movie=movie)
 
-    text = render_to_string(
-        'movies/card.html',
+    text = render_template(
+        'movies/card.jinja',
         context=context
     )
 
     return text
 
 
-def render_movies(
+def truncate_html(text: str, length: int) -> str:
+    """
+    Cuts HTML to `length` characters between tags and entities
+    and closes tags left open.
+    """
+    if len(text) <= length:
+        return text
+
+    parts = []
+    size = 0
+    opened: List[str] = []
+
+    for token in re.findall(r'<[^>]*>|&#?\w+;|[^<&]+|[<&]', text):
+        if token.startswith('</'):
+            # * closing tags always fit, their space is reserved
+            if opened:
+                opened.pop()
+
+            parts.append(token)
+            size += len(token)
+            continue
+
+        reserved = sum(len(f'</{tag}>') for tag in opened)
+
+        if token.startswith('<') and len(token) > 1:
+            tag = re.match(r'<(\w*)', token).group(1)
+
+            if size + len(token) + len(f'</{tag}>') + reserved > length:
+                break
+
+            opened.append(tag)
+        elif size + len(token) + reserved > length:
+            # * text is cut between characters, entities are dropped whole
+            if not token.startswith('&'):
+                parts.append(token[:length - size - reserved])
+
+            break
+
+        parts.append(token)
+        size += len(token)
+
+    parts.extend(f'</{tag}>' for tag in reversed(opened))
+    return ''.join(parts)
+
+
+def render_movie_caption(
         *,
+        movie: 'MovieRecord',
         context: 'CallbackContext',
-        movies: List['Movie'],
+        genres_map: Dict = None
+) -> str:
+    """
+    Renders movie card short enough to be a photo caption.
+    """
+    description_length = 500
+
+    while True:
+        text = render_movie_html(
+            movie=movie,
+            context=context,
+            genres_map=genres_map,
+            description_length=description_length
+        )
+
+        if len(text) <= CAPTION_MAX_LENGTH:
+            return text
+
+        # * other fields are too long themselves, slicing HTML would break
+        # * tags or entities and Telegram would reject the message
+        if not description_length:
+            return truncate_html(text, CAPTION_MAX_LENGTH)
+
+        description_length = max(
+            description_length - (len(text) - CAPTION_MAX_LENGTH),
+            0
+        )
+
+
+def render_movie_description(
+        *,
+        movie: 'MovieRecord',
+        context: 'CallbackContext',
+        genres_map: Dict = None
+) -> str:
+    """
+    Renders short movie description for inline results.
+    """
+    genres = get_movies_genres(
+        movie=movie,
+        context=context,
+        genres_map=genres_map,
+        limit=2
+    )
+    return (
+        f"{_('Rating:')} "
+        f"{movie.vote_average}/{movie.vote_count} "
+        f"({genres})\n"
+        f"{movie.overview[:500]}"
+    )
+
+
+def render_movies_messages(
+        *,
+        context: 'CallbackContext',
+        movies: List['MovieRecord'],
         message: 'Message',
+        genres_map: Dict,
+        language: str = None,
         reply_markup: 'InlineKeyboardMarkup' = None
-):
-    genres_map = (
-        get_cached_movies_genres(
-            language=context.user_data.get('language')
-        )
+) -> int:
+    """
+    Sends backdrop and card as separate messages for every movie.
+
+    Returns amount of Bot API calls made.
+    """
+    api_calls = 0
+    texts = cards.get_or_render(
+        movies=movies,
+        renders={
+            'html': lambda movie: render_movie_html(
+                movie=movie,
+                context=context,
+                genres_map=genres_map
+            )
+        },
+        language=language
     )
 
-    if not movies:
-        message.edit_text(
-            text='That\'s all',
-            reply_markup=reply_markup
+    for movie, is_last in lookahead(movies):
+        image, url = get_movie_backdrop(movie=movie)
+        print('Image:', url)
+        send_movie_photo(
+            bot=message.bot,
+            chat_id=message.chat.id,
+            image=image,
+            url=url
         )
-    else:
-        for movie, is_last in lookahead(movies):
-            image = get_movie_backdrop_url(movie=movie)
-            print('Image:', image)
-            message.bot.send_photo(
-                message.chat.id,
-                photo=image,
-                parse_mode=ParseMode.HTML
-            )
 
-            text = render_movie_html(
+        message.reply_text(
+            text=texts['html', movie.id],
+            parse_mode=ParseMode.HTML,
+            reply_markup=reply_markup if is_last else None
+        )
+        api_calls += 2
+
+    return api_calls
+
+
+def render_movies_album(
+        *,
+        context: 'CallbackContext',
+        movies: List['MovieRecord'],
+        message: 'Message',
+        genres_map: Dict,
+        language: str = None,
+        reply_markup: 'InlineKeyboardMarkup' = None
+) -> int:
+    """
+    Sends movies as albums of backdrops with cards as captions.
+
+    Albums can't have a keyboard, so it's sent with a separate message.
+    Returns amount of Bot API calls made.
+    """
+    api_calls = 0
+    captions = cards.get_or_render(
+        movies=movies,
+        renders={
+            'caption': lambda movie: render_movie_caption(
                 movie=movie,
                 context=context,
                 genres_map=genres_map
             )
+        },
+        language=language
+    )
+    photos = [
+        (
+            *get_movie_backdrop(movie=movie),
+            captions['caption', movie.id]
+        )
+        for movie in movies
+    ]
 
-            message.reply_text(
-                text=text,
-                parse_mode=ParseMode.HTML,
-                reply_markup=reply_markup if is_last else None
+    for start in range(0, len(photos), MEDIA_GROUP_MAX_SIZE):
+        group = photos[start:start + MEDIA_GROUP_MAX_SIZE]
+
+        # * album must contain at least two items
+        if len(group) == 1:
+            image, url, caption = group[0]
+            send_movie_photo(
+                bot=message.bot,
+                chat_id=message.chat.id,
+                image=image,
+                url=url,
+                caption=caption
             )
+        else:
+            send_movie_photos_group(
+                bot=message.bot,
+                chat_id=message.chat.id,
+                photos=group
+            )
+
+        api_calls += 1
+
+    message.reply_text(
+        text=str(_('What\'s next?')),
+        reply_markup=reply_markup
+    )
+    api_calls += 1
+
+    return api_calls
+
+
+def render_movies(
+        *,
+        context: 'CallbackContext',
+        movies: List['MovieRecord'],
+        message: 'Message',
+        reply_markup: 'InlineKeyboardMarkup' = None,
+        mode: str = None
+) -> 'RenderStats':
+    started_at = time.monotonic()
+    mode = mode or settings.TELEGRAM_MOVIES_RENDER_MODE
+    language = context.user_data.get('language')
+    genres_map = get_cached_movies_genres(language=language)
+
+    if not movies:
+        message.edit_text(
+            text='That\'s all',
+            reply_markup=reply_markup
+        )
+        api_calls = 1
+    else:
+        render = (
+            render_movies_album
+            if mode == RENDER_MODE_CHOICES.album
+            else render_movies_messages
+        )
+        api_calls = render(
+            context=context,
+            movies=movies,
+            message=message,
+            genres_map=genres_map,
+            language=language,
+            reply_markup=reply_markup
+        )
+
+    stats = RenderStats(
+        mode=mode,
+        movies=len(movies),
+        api_calls=api_calls,
+        elapsed=time.monotonic() - started_at
+    )
+    print('Render stats:', stats)
+    return stats
 
 
-def get_last_movie_keyboard(*, movies: List['Movie']):
+def get_last_movie_keyboard(
+        *,
+        movies: List['MovieRecord'],
+        context: 'CallbackContext'
+):
     buttons = [
         BACK_BUTTON
     ]
 
-    if movies and movies_search_has_more_pages():
+    if movies and movies_search_has_more_pages(context=context):
         buttons.insert(0, [
             InlineKeyboardButton(
                 text=str(_('Next movies')),
@@ -219,22 +482,20 @@ def build_search_params(
         context: 'CallbackContext',
 ) -> Dict:
     user_data = context.user_data
-    page = get_current_page()
     search_params: 'MultiValueDict' = user_data[CONSTS.search_params]
     callback_data = update.callback_query.data
     print('Callback data:', callback_data)
 
     params = {
-        'language': 'ru',
         'sort_by': 'popularity.desc',
         'include_adult': True,
         'vote_average.gte': 6,
         'vote_count.gte': 200,
-        'page': page
+        'page': 1
     }
 
     if callback_data == ACTION_CHOICES.next_movies:
-        params['page'] += 1
+        params['page'] = get_current_page(context=context) + 1
 
     genres: List = search_params.getlist(CONSTS.genres)
     years: List = search_params.getlist(CONSTS.years)
@@ -271,7 +532,7 @@ def display_search_params(
     genres = (
         ', '.join(
             [
-                genres_map[int(genre_id)]
+                genres_map.get(int(genre_id), genre_id)
                 for genre_id in genres
             ]
         )
@@ -279,8 +540,8 @@ def display_search_params(
     )
     years = ', '.join(years) if years else '-'
 
-    return render_to_string(
-        'movies/search_params.html',
+    return render_template(
+        'movies/search_params.jinja',
         context={
             'genres': genres,
             'years': years
@@ -306,15 +567,66 @@ def get_discovering_movies_callback_text(
     return text
 
 
-def get_current_page() -> int:
-    current_page = int(environ.get('page', 1))
+def get_current_page(*, context: 'CallbackContext') -> int:
+    current_page = context.user_data.get(CONSTS.page, 1)
     return current_page
 
 
-def movies_search_has_more_pages() -> bool:
-    current_page = get_current_page()
-    total_pages = int(environ.get('total_pages', 1))
+def set_current_page(*, context: 'CallbackContext', movies: 'MoviesPage'):
+    """
+    Remembers position of the shown movies page in the conversation.
+    """
+    context.user_data[CONSTS.page] = movies.page
+    context.user_data[CONSTS.total_pages] = movies.total_pages
+
+
+def movies_search_has_more_pages(*, context: 'CallbackContext') -> bool:
+    current_page = get_current_page(context=context)
+    total_pages = context.user_data.get(CONSTS.total_pages, 1)
     print('Page:', current_page)
     print('Total pages:', total_pages)
 
     return current_page < total_pages
+
+
+def touch_user_activity(*, context: 'CallbackContext') -> bool:
+    """
+    Remembers time of the user interaction.
+
+    Returns whether the previous one was within
+    `TELEGRAM_PREFETCH_IDLE_TIMEOUT` seconds, i.e. the user isn't idle.
+    """
+    now = time.time()
+    last_active_at = context.user_data.get(CONSTS.last_active_at)
+    context.user_data[CONSTS.last_active_at] = now
+
+    return (
+        last_active_at is not None
+        and now - last_active_at <= settings.TELEGRAM_PREFETCH_IDLE_TIMEOUT
+    )
+
+
+def prefetch_next_page(
+        *,
+        context: 'CallbackContext',
+        movies: 'MoviesPage',
+        key: str,
+        fetch: Callable[[int], object]
+) -> bool:
+    """
+    Fetches the page after shown `movies` in background, so TMDB response
+    is cached by the time "Next movies" is pressed.
+
+    Skipped for the last page and for users coming back after being idle:
+    they rarely page further, prefetching for them wastes TMDB calls.
+    """
+    is_active = touch_user_activity(context=context)
+
+    if not settings.TELEGRAM_PREFETCH_ENABLED or not movies.has_next or not is_active:
+        return False
+
+    page = movies.page + 1
+    return prefetcher.schedule(
+        (key, context.user_data.get('language'), page),
+        lambda: fetch(page)
+    )
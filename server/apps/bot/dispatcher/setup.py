@@ -1,3 +1,5 @@
+from django.conf import settings
+
 from telegram import Bot as TelegramBot
 from telegram.ext import (
     Dispatcher,
@@ -5,6 +7,8 @@ from telegram.ext import (
 
 from .handlers import get_movie_handler
 from .inline_handlers import get_inline_handler
+from .persistence import DjangoCachePersistence
+from ..tmdb import genres_table
 
 __all__ = (
     'setup_dispatcher',
@@ -12,16 +16,26 @@ __all__ = (
 
 
 def setup_dispatcher(token: str) -> 'Dispatcher':
+    # * genres of all languages are loaded before the first update needs them
+    genres_table.start()
     bot = TelegramBot(token=token)
+    persistence = None
+
+    if settings.TELEGRAM_PERSISTENCE_ENABLED:
+        persistence = DjangoCachePersistence(
+            cache_alias=settings.TELEGRAM_PERSISTENCE_CACHE_ALIAS,
+            timeout=settings.TELEGRAM_PERSISTENCE_TIMEOUT,
+        )
 
     dispatcher = Dispatcher(
         bot=bot,
         update_queue=None,
         workers=0,
         use_context=True,
+        persistence=persistence,
     )
 
-    dispatcher.add_handler(get_movie_handler())
+    dispatcher.add_handler(get_movie_handler(persistent=persistence is not None))
     dispatcher.add_handler(get_inline_handler())
 
     return dispatcher
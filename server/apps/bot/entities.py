@@ -2,6 +2,9 @@ from dataclasses import dataclass
 
 __all__ = (
     'User',
+    'RenderStats',
+    'BroadcastStats',
+    'SyncStats',
 )
 
 
@@ -12,3 +15,35 @@ class User:
     first_name: str = ''
     last_name: str = ''
     language_code: str = ''
+
+
+@dataclass
+class RenderStats:
+    mode: str
+    movies: int
+    api_calls: int
+    elapsed: float
+
+
+@dataclass
+class BroadcastStats:
+    sent: int = 0
+    blocked: int = 0
+    failed: int = 0
+    retries: int = 0
+    checkpoint: int = 0
+    elapsed: float = 0
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.blocked + self.failed
+
+
+@dataclass
+class SyncStats:
+    changed: int = 0
+    fetched: int = 0
+    skipped: int = 0
+    failed: int = 0
+    lag: float = 0
+    elapsed: float = 0
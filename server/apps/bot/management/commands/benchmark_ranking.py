@@ -0,0 +1,76 @@
+import random
+import timeit
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from ...tmdb import MovieRecord
+from ...tmdb.ranking import rank_movies
+
+
+def filter_movies_loop(movies):
+    """
+    Filtering of movies lists before the ranking engine, kept as a baseline.
+    """
+    filtered = [
+        movie
+        for movie in movies
+        if (
+                movie.vote_average > 5
+                and movie.vote_count > 50
+                and movie.backdrop_path
+                and movie.overview
+        )
+    ]
+    return sorted(filtered, key=lambda x: x.vote_average)
+
+
+def get_movies(count: int, seed: int = 0):
+    generator = random.Random(seed)
+    today = date.today()
+    return [
+        MovieRecord(
+            id=movie_id,
+            title=f'Movie {movie_id}',
+            overview='Overview' if generator.random() > 0.1 else '',
+            vote_average=round(generator.uniform(0, 10), 1),
+            vote_count=generator.randint(0, 20000),
+            popularity=generator.expovariate(0.05),
+            release_date=(today - timedelta(days=generator.randint(0, 365 * 40))).isoformat(),
+            backdrop_path='/backdrop.jpg' if generator.random() > 0.1 else None,
+        )
+        for movie_id in range(1, count + 1)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compares movies ranking engine with the filtering loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[20, 40, 200, 2000, 20000],
+            help='Amounts of candidates.'
+        )
+        parser.add_argument('--limit', type=int, default=20, help='Top movies to return.')
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            movies = get_movies(size)
+            number = max(1, 20000 // size)
+            loop = min(timeit.repeat(
+                lambda: filter_movies_loop(movies)[:options['limit']],
+                number=number,
+                repeat=3
+            )) / number
+            engine = min(timeit.repeat(
+                lambda: rank_movies(movies, limit=options['limit']),
+                number=number,
+                repeat=3
+            )) / number
+            self.stdout.write(
+                f'{size:>6} movies: loop {loop * 1e6:>9.1f}us, '
+                f'engine {engine * 1e6:>9.1f}us ({loop / engine:.2f}x)'
+            )
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Bot
+from ...services import Broadcast
+
+
+class Command(BaseCommand):
+    help = 'Sends message to all users of the bot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('bot', type=int, help='Bot id.')
+        parser.add_argument('text', help='Message text.')
+        parser.add_argument(
+            '--name',
+            help='Broadcast name, checkpoint of interrupted broadcast is stored by it and the text. Defaults to the bot id.'
+        )
+        parser.add_argument('--parse-mode', choices=('HTML', 'MarkdownV2'))
+        parser.add_argument(
+            '--include-blocked',
+            action='store_true',
+            help='Send to users who have blocked the bot too.'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore checkpoint and send from the first user.'
+        )
+        parser.add_argument('--workers', type=int, default=settings.BROADCAST_WORKERS)
+        parser.add_argument('--rate', type=float, default=settings.BROADCAST_RATE)
+
+    def handle(self, *args, **options):
+        bot = Bot.objects.filter(pk=options['bot']).first()
+
+        if bot is None:
+            raise CommandError(f'Bot {options["bot"]} does not exist.')
+
+        broadcast = Broadcast(
+            token=bot.token,
+            name=options['name'] or str(bot.pk),
+            text=options['text'],
+            parse_mode=options['parse_mode'],
+            workers=options['workers'],
+            rate=options['rate'],
+            chunk_size=settings.BROADCAST_CHUNK_SIZE,
+            include_blocked=options['include_blocked'],
+        )
+
+        if options['restart']:
+            broadcast.reset_checkpoint()
+
+        def progress(stats):
+            rate = stats.processed / stats.elapsed if stats.elapsed else 0
+            self.stdout.write(
+                f'Processed {stats.processed} ({rate:.1f}/s): '
+                f'sent {stats.sent}, blocked {stats.blocked}, '
+                f'failed {stats.failed}, retries {stats.retries}, '
+                f'checkpoint {stats.checkpoint}'
+            )
+
+        broadcast.run(progress=progress)
+        self.stdout.write(self.style.SUCCESS('Broadcast is finished.'))
@@ -0,0 +1,87 @@
+import gzip
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...tmdb import catalog
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports movies from TMDB daily ids export file '
+        '(gzipped JSON lines) into the catalog.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the export file, e.g. movie_ids_05_15_2021.json.gz.')
+        parser.add_argument(
+            '--offset',
+            type=int,
+            default=0,
+            help='Uncompressed byte offset to resume from, printed with progress.'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        offset = options['offset']
+        opener = gzip.open if path.endswith('.gz') else open
+
+        try:
+            file = opener(path, 'rb')
+        except OSError as e:
+            raise CommandError(f"Can't open {path}: {e}")
+
+        started_at = time.monotonic()
+        imported = 0
+        skipped = 0
+        batch = []
+
+        with file:
+            # * gzip seeks forward by decompressing in chunks, not in memory
+            file.seek(offset)
+
+            for line in file:
+                offset += len(line)
+
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+
+                if not item.get('id'):
+                    skipped += 1
+                    continue
+
+                batch.append(item)
+
+                if len(batch) >= batch_size:
+                    imported += self.save(batch, batch_size)
+                    batch = []
+                    self.report(imported, skipped, offset, started_at)
+
+            if batch:
+                imported += self.save(batch, batch_size)
+
+        self.report(imported, skipped, offset, started_at)
+        self.stdout.write(self.style.SUCCESS('Import is finished.'))
+
+    def save(self, batch, batch_size) -> int:
+        # * offset is reported only once batch is committed, so resuming
+        # * from it never loses rows
+        with transaction.atomic():
+            catalog.save_export_movies(batch, batch_size=batch_size)
+
+        return len(batch)
+
+    def report(self, imported: int, skipped: int, offset: int, started_at: float):
+        elapsed = time.monotonic() - started_at
+        rate = imported / elapsed if elapsed else 0
+        self.stdout.write(
+            f'Imported {imported} ({rate:.0f} rows/s), '
+            f'skipped {skipped}, offset {offset}'
+        )
@@ -0,0 +1,63 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ...tmdb.catalog import prune_pages
+from ...tmdb.sync import sync_changes
+
+
+class Command(BaseCommand):
+    help = 'Refetches catalog movies changed on TMDB since the last sync and prunes outdated lists pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--name', default='movies', help='Sync name, its watermark is stored by.')
+        parser.add_argument(
+            '--days',
+            type=float,
+            help='Sync changes of the last days instead of ones since the watermark.'
+        )
+        parser.add_argument('--workers', type=int, default=settings.TMDB_FETCH_WORKERS)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Repeat sync every given seconds instead of running once.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            since = (
+                timezone.now() - timedelta(days=options['days'])
+                if options['days']
+                else None
+            )
+            stats = sync_changes(
+                name=options['name'],
+                since=since,
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                progress=self.report
+            )
+
+            if not stats.changed:
+                self.report(stats)
+
+            pruned = prune_pages(max_age=settings.TMDB_CATALOG_PAGES_MAX_AGE)
+            self.stdout.write(f'Pruned {pruned} outdated catalog pages')
+            self.stdout.write(self.style.SUCCESS('Sync is finished.'))
+
+            if not options['interval']:
+                break
+
+            time.sleep(options['interval'])
+
+    def report(self, stats):
+        rate = stats.fetched / stats.elapsed if stats.elapsed else 0
+        self.stdout.write(
+            f'Lag {stats.lag / 3600:.1f}h, changed {stats.changed}, '
+            f'fetched {stats.fetched} ({rate:.1f}/s), '
+            f'skipped {stats.skipped}, failed {stats.failed}'
+        )
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicated_chat_users(apps, schema_editor):
+    """
+    Keeps only the latest row of every user.
+    """
+    ChatUser = apps.get_model('bot', 'ChatUser')
+    duplicates = (
+        ChatUser.objects
+        .values('user_id')
+        .annotate(last_pk=Max('pk'), count=Count('pk'))
+        .filter(count__gt=1)
+    )
+
+    for duplicate in duplicates.iterator():
+        (
+            ChatUser.objects
+            .filter(user_id=duplicate['user_id'])
+            .exclude(pk=duplicate['last_pk'])
+            .delete()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicated_chat_users,
+            migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name='chatuser',
+            name='user_id',
+            field=models.CharField(max_length=25, unique=True, verbose_name='User id'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0002_chatuser_user_id_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'verbose_name': 'Genre',
+                'verbose_name_plural': 'Genres',
+            },
+        ),
+        migrations.CreateModel(
+            name='Movie',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('original_title', models.CharField(blank=True, max_length=512, verbose_name='Original title')),
+                ('original_language', models.CharField(blank=True, max_length=10, verbose_name='Original language')),
+                ('release_date', models.DateField(blank=True, null=True, verbose_name='Release date')),
+                ('vote_average', models.FloatField(default=0, verbose_name='Vote average')),
+                ('vote_count', models.PositiveIntegerField(default=0, verbose_name='Vote count')),
+                ('popularity', models.FloatField(default=0, verbose_name='Popularity')),
+                ('adult', models.BooleanField(default=False, verbose_name='Adult')),
+                ('backdrop_path', models.CharField(blank=True, max_length=255, verbose_name='Backdrop path')),
+                ('poster_path', models.CharField(blank=True, max_length=255, verbose_name='Poster path')),
+                ('synced_at', models.DateTimeField(blank=True, null=True, verbose_name='Synced at')),
+                ('genres', models.ManyToManyField(blank=True, related_name='movies', to='bot.Genre')),
+            ],
+            options={
+                'verbose_name': 'Movie',
+                'verbose_name_plural': 'Movies',
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreTranslation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=10, verbose_name='Language')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translations', to='bot.genre')),
+            ],
+            options={
+                'verbose_name': 'Genre translation',
+                'verbose_name_plural': 'Genres translations',
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieTranslation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=10, verbose_name='Language')),
+                ('title', models.CharField(blank=True, max_length=512, verbose_name='Title')),
+                ('overview', models.TextField(blank=True, verbose_name='Overview')),
+                ('synced_at', models.DateTimeField(blank=True, null=True, verbose_name='Synced at')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translations', to='bot.movie')),
+            ],
+            options={
+                'verbose_name': 'Movie translation',
+                'verbose_name_plural': 'Movies translations',
+                'unique_together': {('movie', 'language')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-popularity'], name='bot_movie_popular_40463b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['release_date', 'vote_count', 'vote_average'], name='bot_movie_release_fe5628_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='genretranslation',
+            unique_together={('genre', 'language')},
+        ),
+    ]
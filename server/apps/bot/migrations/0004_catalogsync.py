@@ -0,0 +1,25 @@
+# Generated by Django 3.2.25 on 2026-10-18 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0003_movies_catalog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogSync',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True, verbose_name='Name')),
+                ('watermark', models.DateTimeField(verbose_name='Watermark')),
+            ],
+            options={
+                'verbose_name': 'Catalog sync',
+                'verbose_name_plural': 'Catalog syncs',
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+from django.db import migrations
+
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE bot_movie_search USING fts5(
+        title,
+        original_title,
+        language UNINDEXED,
+        movie_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_insert AFTER INSERT ON bot_movietranslation
+    BEGIN
+        INSERT INTO bot_movie_search (rowid, title, original_title, language, movie_id)
+        SELECT new.id, new.title, m.original_title, new.language, new.movie_id
+        FROM bot_movie m WHERE m.id = new.movie_id;
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_update AFTER UPDATE OF title ON bot_movietranslation
+    WHEN old.title IS NOT new.title
+    BEGIN
+        UPDATE bot_movie_search SET title = new.title WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_delete AFTER DELETE ON bot_movietranslation
+    BEGIN
+        DELETE FROM bot_movie_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_movie_update AFTER UPDATE OF original_title ON bot_movie
+    WHEN old.original_title IS NOT new.original_title
+    BEGIN
+        UPDATE bot_movie_search SET original_title = new.original_title
+        WHERE rowid IN (SELECT id FROM bot_movietranslation WHERE movie_id = new.id);
+    END
+    """,
+    """
+    INSERT INTO bot_movie_search (rowid, title, original_title, language, movie_id)
+    SELECT t.id, t.title, m.original_title, t.language, t.movie_id
+    FROM bot_movietranslation t JOIN bot_movie m ON m.id = t.movie_id
+    """,
+)
+
+SQLITE_BACKWARD = (
+    'DROP TRIGGER IF EXISTS bot_movie_search_movie_update',
+    'DROP TRIGGER IF EXISTS bot_movie_search_delete',
+    'DROP TRIGGER IF EXISTS bot_movie_search_update',
+    'DROP TRIGGER IF EXISTS bot_movie_search_insert',
+    'DROP TABLE IF EXISTS bot_movie_search',
+)
+
+POSTGRESQL_FORWARD = (
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX bot_movietranslation_title_trgm ON bot_movietranslation USING gin (title gin_trgm_ops)',
+    'CREATE INDEX bot_movie_original_title_trgm ON bot_movie USING gin (original_title gin_trgm_ops)',
+)
+
+POSTGRESQL_BACKWARD = (
+    'DROP INDEX IF EXISTS bot_movie_original_title_trgm',
+    'DROP INDEX IF EXISTS bot_movietranslation_title_trgm',
+)
+
+
+def run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    run(
+        schema_editor,
+        {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    run(
+        schema_editor,
+        {'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0004_catalogsync'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
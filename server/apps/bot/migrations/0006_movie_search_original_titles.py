@@ -0,0 +1,100 @@
+from importlib import import_module
+
+from django.db import migrations
+
+# * localized titles are rows of their translations, original titles are
+# * rows of movies under negative rowids with empty language, so movies
+# * without translations are found too
+SQLITE_FORWARD = (
+    'DROP TRIGGER IF EXISTS bot_movie_search_movie_update',
+    'DROP TRIGGER IF EXISTS bot_movie_search_delete',
+    'DROP TRIGGER IF EXISTS bot_movie_search_update',
+    'DROP TRIGGER IF EXISTS bot_movie_search_insert',
+    'DROP TABLE IF EXISTS bot_movie_search',
+    """
+    CREATE VIRTUAL TABLE bot_movie_search USING fts5(
+        title,
+        language UNINDEXED,
+        movie_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_insert AFTER INSERT ON bot_movietranslation
+    BEGIN
+        INSERT INTO bot_movie_search (rowid, title, language, movie_id)
+        VALUES (new.id, new.title, new.language, new.movie_id);
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_update AFTER UPDATE OF title ON bot_movietranslation
+    WHEN old.title IS NOT new.title
+    BEGIN
+        UPDATE bot_movie_search SET title = new.title WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_delete AFTER DELETE ON bot_movietranslation
+    BEGIN
+        DELETE FROM bot_movie_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_movie_insert AFTER INSERT ON bot_movie
+    BEGIN
+        INSERT INTO bot_movie_search (rowid, title, language, movie_id)
+        VALUES (-new.id, new.original_title, '', new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_movie_update AFTER UPDATE OF original_title ON bot_movie
+    WHEN old.original_title IS NOT new.original_title
+    BEGIN
+        UPDATE bot_movie_search SET title = new.original_title WHERE rowid = -new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER bot_movie_search_movie_delete AFTER DELETE ON bot_movie
+    BEGIN
+        DELETE FROM bot_movie_search WHERE rowid = -old.id;
+    END
+    """,
+    """
+    INSERT INTO bot_movie_search (rowid, title, language, movie_id)
+    SELECT id, title, language, movie_id FROM bot_movietranslation
+    """,
+    """
+    INSERT INTO bot_movie_search (rowid, title, language, movie_id)
+    SELECT -id, original_title, '', id FROM bot_movie
+    """,
+)
+
+SQLITE_BACKWARD = (
+    'DROP TRIGGER IF EXISTS bot_movie_search_movie_delete',
+    'DROP TRIGGER IF EXISTS bot_movie_search_movie_insert',
+)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+
+
+def restore_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        previous = import_module(f'{__package__}.0005_movie_search_index')
+
+        for statement in SQLITE_BACKWARD + previous.SQLITE_BACKWARD + previous.SQLITE_FORWARD:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0005_movie_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, restore_search_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0006_movie_search_original_titles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=32, verbose_name='Endpoint')),
+                ('language', models.CharField(max_length=10, verbose_name='Language')),
+                ('params_hash', models.CharField(max_length=32, verbose_name='Params hash')),
+                ('movie_ids', models.JSONField(default=list, verbose_name='Movies ids')),
+                ('total_pages', models.PositiveIntegerField(default=1, verbose_name='Total pages')),
+                ('synced_at', models.DateTimeField(verbose_name='Synced at')),
+            ],
+            options={
+                'verbose_name': 'Catalog page',
+                'verbose_name_plural': 'Catalog pages',
+                'unique_together': {('endpoint', 'language', 'params_hash')},
+            },
+        ),
+    ]
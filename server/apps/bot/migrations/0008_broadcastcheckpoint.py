@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-18 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0007_catalogpage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, verbose_name='Name')),
+                ('text_hash', models.CharField(max_length=32, verbose_name='Text hash')),
+                ('checkpoint', models.PositiveBigIntegerField(default=0, verbose_name='Checkpoint')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+            ],
+            options={
+                'verbose_name': 'Broadcast checkpoint',
+                'verbose_name_plural': 'Broadcast checkpoints',
+                'unique_together': {('name', 'text_hash')},
+            },
+        ),
+    ]
@@ -3,7 +3,14 @@ from django.utils.translation import ugettext_lazy as _
 
 __all__ = (
     'Bot',
-    'ChatUser'
+    'ChatUser',
+    'Genre',
+    'GenreTranslation',
+    'Movie',
+    'MovieTranslation',
+    'CatalogPage',
+    'CatalogSync',
+    'BroadcastCheckpoint'
 )
 
 
@@ -28,7 +35,8 @@ class Bot(models.Model):
 class ChatUser(models.Model):
     user_id = models.CharField(
         _('User id'),
-        max_length=25
+        max_length=25,
+        unique=True
     )
     username = models.CharField(
         _('Username'),
@@ -61,3 +69,235 @@ class ChatUser(models.Model):
 
     def __str__(self):
         return self.user_id
+
+
+class Genre(models.Model):
+    # * TMDB id
+    id = models.PositiveIntegerField(
+        primary_key=True
+    )
+
+    class Meta:
+        verbose_name = _('Genre')
+        verbose_name_plural = _('Genres')
+
+    def __str__(self):
+        return str(self.id)
+
+
+class GenreTranslation(models.Model):
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        related_name='translations'
+    )
+    language = models.CharField(
+        _('Language'),
+        max_length=10
+    )
+    name = models.CharField(
+        _('Name'),
+        max_length=255
+    )
+
+    class Meta:
+        verbose_name = _('Genre translation')
+        verbose_name_plural = _('Genres translations')
+        unique_together = ('genre', 'language')
+
+    def __str__(self):
+        return self.name
+
+
+class Movie(models.Model):
+    """
+    Local snapshot of TMDB movie data.
+    """
+    # * TMDB id
+    id = models.PositiveIntegerField(
+        primary_key=True
+    )
+    original_title = models.CharField(
+        _('Original title'),
+        blank=True,
+        max_length=512
+    )
+    original_language = models.CharField(
+        _('Original language'),
+        blank=True,
+        max_length=10
+    )
+    release_date = models.DateField(
+        _('Release date'),
+        blank=True,
+        null=True
+    )
+    vote_average = models.FloatField(
+        _('Vote average'),
+        default=0
+    )
+    vote_count = models.PositiveIntegerField(
+        _('Vote count'),
+        default=0
+    )
+    popularity = models.FloatField(
+        _('Popularity'),
+        default=0
+    )
+    adult = models.BooleanField(
+        _('Adult'),
+        default=False
+    )
+    backdrop_path = models.CharField(
+        _('Backdrop path'),
+        blank=True,
+        max_length=255
+    )
+    poster_path = models.CharField(
+        _('Poster path'),
+        blank=True,
+        max_length=255
+    )
+    genres = models.ManyToManyField(
+        Genre,
+        blank=True,
+        related_name='movies'
+    )
+    synced_at = models.DateTimeField(
+        _('Synced at'),
+        blank=True,
+        null=True
+    )
+
+    class Meta:
+        verbose_name = _('Movie')
+        verbose_name_plural = _('Movies')
+        # * filters and ordering of discovering movies
+        indexes = [
+            models.Index(fields=['-popularity']),
+            models.Index(fields=['release_date', 'vote_count', 'vote_average']),
+        ]
+
+    def __str__(self):
+        return self.original_title or str(self.id)
+
+
+class MovieTranslation(models.Model):
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='translations'
+    )
+    language = models.CharField(
+        _('Language'),
+        max_length=10
+    )
+    title = models.CharField(
+        _('Title'),
+        blank=True,
+        max_length=512
+    )
+    overview = models.TextField(
+        _('Overview'),
+        blank=True
+    )
+    synced_at = models.DateTimeField(
+        _('Synced at'),
+        blank=True,
+        null=True
+    )
+
+    class Meta:
+        verbose_name = _('Movie translation')
+        verbose_name_plural = _('Movies translations')
+        unique_together = ('movie', 'language')
+
+    def __str__(self):
+        return self.title
+
+
+class CatalogPage(models.Model):
+    """
+    Movies of a TMDB list response in order, so lists are read
+    from the catalog instead of asking TMDB again.
+    """
+    endpoint = models.CharField(
+        _('Endpoint'),
+        max_length=32
+    )
+    language = models.CharField(
+        _('Language'),
+        max_length=10
+    )
+    # * digest of the request params including the page number
+    params_hash = models.CharField(
+        _('Params hash'),
+        max_length=32
+    )
+    movie_ids = models.JSONField(
+        _('Movies ids'),
+        default=list
+    )
+    total_pages = models.PositiveIntegerField(
+        _('Total pages'),
+        default=1
+    )
+    synced_at = models.DateTimeField(
+        _('Synced at')
+    )
+
+    class Meta:
+        verbose_name = _('Catalog page')
+        verbose_name_plural = _('Catalog pages')
+        unique_together = ('endpoint', 'language', 'params_hash')
+
+    def __str__(self):
+        return f'{self.endpoint} {self.language} {self.params_hash}'
+
+
+class CatalogSync(models.Model):
+    name = models.CharField(
+        _('Name'),
+        max_length=64,
+        unique=True
+    )
+    # * changes made before it are already applied to the catalog
+    watermark = models.DateTimeField(
+        _('Watermark')
+    )
+
+    class Meta:
+        verbose_name = _('Catalog sync')
+        verbose_name_plural = _('Catalog syncs')
+
+    def __str__(self):
+        return self.name
+
+
+class BroadcastCheckpoint(models.Model):
+    name = models.CharField(
+        _('Name'),
+        max_length=64
+    )
+    # * digest of the text, so another text of the same name starts over
+    text_hash = models.CharField(
+        _('Text hash'),
+        max_length=32
+    )
+    # * chat users up to it already got the message
+    checkpoint = models.PositiveBigIntegerField(
+        _('Checkpoint'),
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        _('Updated at'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('Broadcast checkpoint')
+        verbose_name_plural = _('Broadcast checkpoints')
+        unique_together = ('name', 'text_hash')
+
+    def __str__(self):
+        return f'{self.name} {self.checkpoint}'
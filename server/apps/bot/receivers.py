@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Bot
+from .registry import registry
+
+
+@receiver(pre_save, sender=Bot)
+def forget_rotated_bot_token(sender, instance: 'Bot', **kwargs):
+    """
+    Drop dispatcher of the previous token when bot token is changed.
+    """
+    if instance.pk is None:
+        return
+
+    previous_token = (
+        Bot.objects
+        .filter(pk=instance.pk)
+        .values_list('token', flat=True)
+        .first()
+    )
+
+    if previous_token and previous_token != instance.token:
+        registry.remove(previous_token)
+
+
+@receiver(post_delete, sender=Bot)
+def forget_deleted_bot(sender, instance: 'Bot', **kwargs):
+    registry.remove(instance.token)
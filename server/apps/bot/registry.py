@@ -1,4 +1,8 @@
-from typing import Dict, List, TYPE_CHECKING
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, TYPE_CHECKING
+
+from django.conf import settings
 
 if TYPE_CHECKING:
     from telegram.ext import Dispatcher
@@ -10,34 +14,124 @@ __all__ = (
 
 
 class Registry:
-    def __init__(self):
-        self.storage: List['Dispatcher'] = []
-        self.cache: Dict[str, 'Dispatcher'] = {}
+    """
+    Dispatchers keyed by bot token.
+
+    Dispatchers are built lazily on the first webhook hit of a bot
+    and least recently used ones are evicted once `maxsize` is reached.
+    Building is done out of the registry lock, under a lock of the token,
+    so a slow build stalls only updates of its own bot.
+    """
+    def __init__(
+            self,
+            maxsize: int = 100,
+            factory: Callable = None,
+            lookup: Callable[[str], bool] = None
+    ):
+        self.maxsize = maxsize
+        self.factory = factory
+        self.lookup = lookup
+        self.cache: 'OrderedDict[str, Dispatcher]' = OrderedDict()
+        self._building: Dict[str, threading.Lock] = {}
+        self._lock = threading.RLock()
 
     def __str__(self):
-        return str(self.cache)
+        return str(list(self.cache.keys()))
 
     def __iter__(self):
-        for entry in self.storage:
+        with self._lock:
+            entries = list(self.cache.values())
+
+        for entry in entries:
             yield entry
 
-    def get_dispatcher(self, token: str):
-        if token not in self.cache:
-            self.cache[token] = next((x for x in self if x.bot.token == token), None)
+    def __len__(self):
+        return len(self.cache)
+
+    def __contains__(self, token: str):
+        return token in self.cache
+
+    def is_known(self, token: str) -> bool:
+        """
+        Tells whether token is of a bot, without building its dispatcher.
+        """
+        if token in self.cache:
+            return True
+
+        return self.lookup is not None and self.lookup(token)
+
+    def get_dispatcher(self, token: str) -> Optional['Dispatcher']:
+        dispatcher = self.get_entry(token)
+
+        if dispatcher is not None or self.factory is None:
+            return dispatcher
+
+        with self._lock:
+            building = self._building.setdefault(token, threading.Lock())
+
+        try:
+            with building:
+                # * dispatcher may be built while the token lock was awaited
+                dispatcher = self.get_entry(token)
+
+                if dispatcher is None:
+                    dispatcher = self.factory(token)
+
+                    if dispatcher is not None:
+                        self.add_entry(dispatcher)
+        finally:
+            with self._lock:
+                self._building.pop(token, None)
 
-            if self.cache[token] is None:
-                del self.cache[token]
-                return None
+        return dispatcher
 
-        return self.cache[token]
+    def get_entry(self, token: str) -> Optional['Dispatcher']:
+        with self._lock:
+            dispatcher = self.cache.get(token)
+
+            if dispatcher is not None:
+                self.cache.move_to_end(token)
+
+            return dispatcher
 
     def register(self, item: 'Dispatcher'):
         return self.add_entry(item)
 
     def add_entry(self, item: 'Dispatcher'):
-        self.storage.append(item)
+        with self._lock:
+            self.cache[item.bot.token] = item
+            self.cache.move_to_end(item.bot.token)
+
+            while len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
 
         return item
 
+    def remove(self, token: str) -> Optional['Dispatcher']:
+        with self._lock:
+            return self.cache.pop(token, None)
+
+
+def bot_exists(token: str) -> bool:
+    from .models import Bot
+
+    return Bot.objects.filter(token=token).exists()
 
-registry = Registry()
+
+def build_dispatcher(token: str) -> Optional['Dispatcher']:
+    """
+    Builds dispatcher only for tokens of known bots.
+    """
+    from .services import get_dispatcher
+
+    if not bot_exists(token):
+        return None
+
+    return get_dispatcher(token=token)
+
+
+registry = Registry(
+    maxsize=settings.TELEGRAM_REGISTRY_SIZE,
+    factory=build_dispatcher,
+    lookup=bot_exists
+)
@@ -1,2 +1,3 @@
+from .broadcast import *
 from .user import *
 from .webhook import *
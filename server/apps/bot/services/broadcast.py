@@ -0,0 +1,227 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from telegram import Bot
+from telegram.error import RetryAfter
+from telegram.utils.request import Request
+
+from ..entities import BroadcastStats
+from ..models import BroadcastCheckpoint, ChatUser
+from .user import DELIVERY_STATUS_CHOICES, deliver_message
+
+__all__ = (
+    'RateLimiter',
+    'Broadcast',
+)
+
+
+class RateLimiter:
+    """
+    Spaces calls evenly to keep them under `rate` per second,
+    shared between threads.
+    """
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            at = max(self._next_at, now)
+            self._next_at = at + self.interval
+
+        if at > now:
+            time.sleep(at - now)
+
+    def pause(self, seconds: float):
+        """
+        Holds all calls, e.g. when Telegram asks to retry after a while.
+        """
+        with self._lock:
+            self._next_at = max(self._next_at, time.monotonic() + seconds)
+
+
+class Broadcast:
+    """
+    Sends message to all chat users concurrently.
+
+    Recipients are streamed from the database by primary key in chunks.
+    Sends of all threads share one bot connections pool and global rate
+    limit, `RetryAfter` pauses all of them. Since every chat gets one
+    message, per chat limit matters only for retries, those are spaced
+    by at least `chat_interval` seconds. Users statuses are updated with one
+    query per chunk. After every chunk last processed primary key is stored
+    as a checkpoint of the broadcast name and text, so interrupted broadcast
+    resumes from it. Checkpoint is removed once the broadcast is finished.
+    """
+    def __init__(
+            self,
+            *,
+            token: str,
+            name: str,
+            text: str,
+            parse_mode: str = None,
+            disable_web_page_preview: bool = None,
+            workers: int = 8,
+            rate: float = 25,
+            chat_interval: float = 1,
+            max_retries: int = 3,
+            chunk_size: int = 500,
+            include_blocked: bool = False
+    ):
+        self.token = token
+        self.name = name
+        self.text = text
+        self.parse_mode = parse_mode
+        self.disable_web_page_preview = disable_web_page_preview
+        self.workers = workers
+        self.chat_interval = chat_interval
+        self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.include_blocked = include_blocked
+        self.limiter = RateLimiter(rate)
+        self.bot = Bot(
+            token,
+            request=Request(con_pool_size=workers + 2)
+        )
+        self.stats = BroadcastStats()
+        self._lock = threading.Lock()
+
+    @property
+    def text_hash(self) -> str:
+        return hashlib.md5(self.text.encode()).hexdigest()
+
+    def get_checkpoint(self) -> int:
+        state = BroadcastCheckpoint.objects.filter(
+            name=self.name,
+            text_hash=self.text_hash
+        ).first()
+        return state.checkpoint if state is not None else 0
+
+    def set_checkpoint(self, pk: int):
+        BroadcastCheckpoint.objects.update_or_create(
+            name=self.name,
+            text_hash=self.text_hash,
+            defaults={'checkpoint': pk}
+        )
+
+    def reset_checkpoint(self):
+        BroadcastCheckpoint.objects.filter(
+            name=self.name,
+            text_hash=self.text_hash
+        ).delete()
+
+    def get_recipients(self, after: int):
+        queryset = ChatUser.objects.filter(pk__gt=after)
+
+        if not self.include_blocked:
+            queryset = queryset.filter(is_blocked_bot=False)
+
+        return (
+            queryset
+            .order_by('pk')
+            .values_list('pk', 'user_id', 'is_blocked_bot')
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+    def run(self, progress: Callable[['BroadcastStats'], None] = None) -> 'BroadcastStats':
+        started_at = time.monotonic()
+        self.stats.checkpoint = self.get_checkpoint()
+        chunk: List[Tuple[int, str, bool]] = []
+
+        with ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix=f'broadcast-{self.name}'
+        ) as executor:
+            for recipient in self.get_recipients(after=self.stats.checkpoint):
+                chunk.append(recipient)
+
+                if len(chunk) >= self.chunk_size:
+                    self.process_chunk(executor, chunk)
+                    self.stats.elapsed = time.monotonic() - started_at
+                    chunk = []
+
+                    if progress is not None:
+                        progress(self.stats)
+
+            if chunk:
+                self.process_chunk(executor, chunk)
+                self.stats.elapsed = time.monotonic() - started_at
+
+                if progress is not None:
+                    progress(self.stats)
+
+        # * only interrupted broadcast is resumed
+        self.reset_checkpoint()
+        return self.stats
+
+    def process_chunk(
+            self,
+            executor: 'ThreadPoolExecutor',
+            chunk: List[Tuple[int, str, bool]]
+    ):
+        statuses = list(
+            executor.map(
+                lambda recipient: self.send(recipient[1]),
+                chunk
+            )
+        )
+        blocked = []
+        unblocked = []
+
+        for (_, user_id, is_blocked_bot), status in zip(chunk, statuses):
+            if status == DELIVERY_STATUS_CHOICES.blocked and not is_blocked_bot:
+                blocked.append(user_id)
+            elif status == DELIVERY_STATUS_CHOICES.sent and is_blocked_bot:
+                unblocked.append(user_id)
+
+        if blocked:
+            ChatUser.objects.filter(user_id__in=blocked).update(is_blocked_bot=True)
+
+        if unblocked:
+            ChatUser.objects.filter(user_id__in=unblocked).update(is_blocked_bot=False)
+
+        self.stats.checkpoint = chunk[-1][0]
+        self.set_checkpoint(self.stats.checkpoint)
+
+    def send(self, user_id: str) -> str:
+        status = DELIVERY_STATUS_CHOICES.failed
+        last_sent_at: Optional[float] = None
+
+        for attempt in range(self.max_retries + 1):
+            if last_sent_at is not None:
+                wait = last_sent_at + self.chat_interval - time.monotonic()
+
+                if wait > 0:
+                    time.sleep(wait)
+
+            self.limiter.acquire()
+            last_sent_at = time.monotonic()
+
+            try:
+                status = deliver_message(
+                    bot=self.bot,
+                    user_id=user_id,
+                    text=self.text,
+                    parse_mode=self.parse_mode,
+                    disable_web_page_preview=self.disable_web_page_preview,
+                )
+            except RetryAfter as e:
+                print(f'Flood limit is reached, retry after {e.retry_after}s.')
+                self.limiter.pause(e.retry_after)
+                self._count('retries')
+                status = DELIVERY_STATUS_CHOICES.failed
+                continue
+
+            break
+
+        self._count(status)
+        return status
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
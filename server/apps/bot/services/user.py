@@ -1,14 +1,24 @@
+import atexit
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from dataclasses import asdict, fields
+from typing import Dict, Iterable, TYPE_CHECKING
 
 from django.conf import settings
+from django.core.cache import caches
 from django.utils.translation import activate
-from typing import TYPE_CHECKING
 
+from model_utils import Choices
 from telegram import Bot, MessageEntity
-from telegram.error import Unauthorized
+from telegram.error import RetryAfter, Unauthorized
+
+from shared.db import bulk_upsert
 
 from ..entities import User as UserEntity
 from ..models import ChatUser
+from ..utils import PeriodicTask, closing_connections
 
 if TYPE_CHECKING:
     from telegram import Update
@@ -17,10 +27,21 @@ if TYPE_CHECKING:
 __all__ = (
     'parse_user',
     'save_user',
+    'save_users',
+    'DELIVERY_STATUS_CHOICES',
+    'deliver_message',
+    'ChatUsersBuffer',
+    'chat_users_buffer',
     'send_message',
     'activate_user_language'
 )
 
+DELIVERY_STATUS_CHOICES = Choices(
+    ('sent', 'Sent'),
+    ('blocked', 'Bot is blocked by user'),
+    ('failed', 'Failed'),
+)
+
 
 def parse_user(*, update: 'Update', context: 'CallbackContext') -> 'UserEntity':
     if update.message is not None:
@@ -56,9 +77,145 @@ def save_user(*, user_entity: 'UserEntity') -> 'ChatUser':
     )
 
 
-def send_message(
+def save_users(
+        user_entities: Iterable['UserEntity'],
+        batch_size: int = 1000
+) -> int:
+    """
+    Creates or updates chat users profiles with bulk upserts by `user_id`.
+    """
+    profile_fields = [
+        field.name
+        for field in fields(UserEntity)
+        if field.name != 'id'
+    ]
+
+    def get_rows():
+        for user_entity in user_entities:
+            data = asdict(user_entity)
+            data['user_id'] = str(data.pop('id'))
+            yield data
+
+    return bulk_upsert(
+        ChatUser,
+        get_rows(),
+        unique_fields=['user_id'],
+        update_fields=profile_fields,
+        batch_size=batch_size
+    )
+
+
+class ChatUsersBuffer:
+    """
+    Write-behind buffer of chat users profiles.
+
+    Every update carries user profile, but it almost never changes.
+    Fingerprint of the last saved profile is kept in memory and in the
+    Django cache, so unchanged profiles never reach the database.
+    Changed ones are collected and saved with bulk queries
+    every `flush_interval` seconds.
+    """
+    def __init__(
+            self,
+            *,
+            cache_alias: str = 'default',
+            timeout: int = None,
+            local_size: int = 10000,
+            flush_interval: float = 5
+    ):
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self.local_size = local_size
+        self.local: 'OrderedDict[str, str]' = OrderedDict()
+        self.pending: Dict[str, 'UserEntity'] = {}
+        self._lock = threading.Lock()
+        self._flusher = PeriodicTask(
+            self.flush,
+            interval=flush_interval,
+            name='chat-users-flush'
+        )
+        atexit.register(self.flush)
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_key(self, user_id: str) -> str:
+        return f'chat_user:fingerprint:{user_id}'
+
+    def get_fingerprint(self, user_entity: 'UserEntity') -> str:
+        data = json.dumps(asdict(user_entity), sort_keys=True, default=str)
+        return hashlib.md5(data.encode()).hexdigest()
+
+    def save(self, user_entity: 'UserEntity') -> bool:
+        """
+        Schedules user saving if profile is changed, returns if it is.
+        """
+        user_id = str(user_entity.id)
+        fingerprint = self.get_fingerprint(user_entity)
+
+        with self._lock:
+            if self.local.get(user_id) == fingerprint:
+                self.local.move_to_end(user_id)
+                return False
+
+        changed = self.cache.get(self.get_key(user_id)) != fingerprint
+
+        with self._lock:
+            self._remember(user_id, fingerprint)
+
+            if changed:
+                self.pending[user_id] = user_entity
+
+        if changed:
+            self._flusher.start()
+
+        return changed
+
+    @closing_connections
+    def flush(self):
+        with self._lock:
+            pending, self.pending = self.pending, {}
+
+        if not pending:
+            return
+
+        try:
+            save_users(pending.values())
+        except Exception:
+            # * forget fingerprints, so users are saved with the next update
+            with self._lock:
+                for user_id in pending:
+                    self.local.pop(user_id, None)
+            raise
+
+        self.cache.set_many(
+            {
+                self.get_key(user_id): self.get_fingerprint(user_entity)
+                for user_id, user_entity in pending.items()
+            },
+            timeout=self.timeout
+        )
+
+    def _remember(self, user_id: str, fingerprint: str):
+        self.local[user_id] = fingerprint
+        self.local.move_to_end(user_id)
+
+        while len(self.local) > self.local_size:
+            self.local.popitem(last=False)
+
+
+chat_users_buffer = ChatUsersBuffer(
+    cache_alias=settings.CHAT_USERS_CACHE_ALIAS,
+    timeout=settings.CHAT_USERS_FINGERPRINT_TIMEOUT,
+    local_size=settings.CHAT_USERS_LOCAL_SIZE,
+    flush_interval=settings.CHAT_USERS_FLUSH_INTERVAL,
+)
+
+
+def deliver_message(
         *,
-        token: str,
+        bot: 'Bot',
         user_id: str,
         text: str,
         parse_mode=None,
@@ -66,9 +223,12 @@ def send_message(
         reply_to_message_id=None,
         disable_web_page_preview=None,
         entities=None,
-) -> bool:
-    bot = Bot(token)
+) -> str:
+    """
+    Sends message with given bot and returns delivery status.
 
+    `RetryAfter` is raised, so caller decides how to wait for flood limits.
+    """
     try:
         if entities:
             entities = [
@@ -80,7 +240,7 @@ def send_message(
                 for entity in entities
             ]
 
-        message = bot.send_message(
+        bot.send_message(
             chat_id=user_id,
             text=text,
             parse_mode=parse_mode,
@@ -89,17 +249,51 @@ def send_message(
             disable_web_page_preview=disable_web_page_preview,
             entities=entities,
         )
+    except RetryAfter:
+        raise
     except Unauthorized:
         print(f"Can't send message to {user_id}. Reason: Bot was stopped.")
-        ChatUser.objects.filter(user_id=user_id).update(is_blocked_bot=True)
-        success = False
+        return DELIVERY_STATUS_CHOICES.blocked
     except Exception as e:
         print(f"Can't send message to {user_id}. Reason: {e}")
-        success = False
-    else:
-        success = True
+        return DELIVERY_STATUS_CHOICES.failed
+
+    return DELIVERY_STATUS_CHOICES.sent
+
+
+def send_message(
+        *,
+        token: str,
+        user_id: str,
+        text: str,
+        parse_mode=None,
+        reply_markup=None,
+        reply_to_message_id=None,
+        disable_web_page_preview=None,
+        entities=None,
+        bot: 'Bot' = None,
+) -> bool:
+    try:
+        status = deliver_message(
+            bot=bot or Bot(token),
+            user_id=user_id,
+            text=text,
+            parse_mode=parse_mode,
+            reply_markup=reply_markup,
+            reply_to_message_id=reply_to_message_id,
+            disable_web_page_preview=disable_web_page_preview,
+            entities=entities,
+        )
+    except RetryAfter as e:
+        print(f"Can't send message to {user_id}. Reason: {e}")
+        status = DELIVERY_STATUS_CHOICES.failed
+
+    if status == DELIVERY_STATUS_CHOICES.blocked:
+        ChatUser.objects.filter(user_id=user_id).update(is_blocked_bot=True)
+    elif status == DELIVERY_STATUS_CHOICES.sent:
         ChatUser.objects.filter(user_id=user_id).update(is_blocked_bot=False)
-    return success
+
+    return status == DELIVERY_STATUS_CHOICES.sent
 
 
 def activate_user_language(*, user: 'UserEntity'):
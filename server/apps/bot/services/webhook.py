@@ -1,11 +1,13 @@
 import json
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Union
 
 from django.urls import reverse
-from telegram import Bot as TelegramBot, Update
+from telegram import Update
 from telegram.ext import Updater
 
+from ..dispatcher.persistence import DjangoCachePersistence
 from ..dispatcher.setup import setup_dispatcher
+from ..workers import update_queue
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
@@ -15,7 +17,10 @@ if TYPE_CHECKING:
 __all__ = (
     'set_webhook',
     'get_dispatcher',
-    'process_webhook_event'
+    'parse_webhook_event',
+    'process_update',
+    'process_webhook_event',
+    'enqueue_webhook_event'
 )
 
 
@@ -49,20 +54,58 @@ def get_dispatcher(token: str) -> 'Dispatcher':
     return dispatcher
 
 
+def parse_webhook_event(
+        *,
+        request_body: Union[bytes, Dict],
+        dispatcher: 'Dispatcher'
+) -> 'Update':
+    if not isinstance(request_body, dict):
+        request_body = json.loads(request_body)
+
+    return Update.de_json(request_body, dispatcher.bot)
+
+
+def process_update(*, dispatcher: 'Dispatcher', update: 'Update'):
+    if isinstance(dispatcher.persistence, DjangoCachePersistence):
+        dispatcher.persistence.refresh(dispatcher=dispatcher, update=update)
+
+    dispatcher.process_update(update)
+
+
 def process_webhook_event(
         token: str,
         request_body: bytes,
         dispatcher: 'Dispatcher' = None
 ):
-    if not isinstance(request_body, dict):
-        request_body = json.loads(request_body)
+    if dispatcher is None:
+        dispatcher: 'Dispatcher' = get_dispatcher(token)
+
+    data = parse_webhook_event(
+        request_body=request_body,
+        dispatcher=dispatcher
+    )
+    process_update(dispatcher=dispatcher, update=data)
+
+    return dispatcher
 
-    bot = TelegramBot(token=token)
-    data = Update.de_json(request_body, bot)
 
+def enqueue_webhook_event(
+        token: str,
+        request_body: bytes,
+        dispatcher: 'Dispatcher' = None
+):
+    """
+    Validates update and hands it over to the workers pool.
+
+    Raises `queue.Full` if workers can't keep up with incoming updates.
+    """
     if dispatcher is None:
         dispatcher: 'Dispatcher' = get_dispatcher(token)
 
-    dispatcher.process_update(data)
+    data = parse_webhook_event(
+        request_body=request_body,
+        dispatcher=dispatcher
+    )
+    update_queue.put(dispatcher, data)
 
     return dispatcher
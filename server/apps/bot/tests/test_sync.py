@@ -0,0 +1,194 @@
+import json
+import re
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import CatalogSync, Movie, MovieTranslation
+from ..tmdb.client import TMDBClient
+from ..tmdb.sync import sync_changes
+
+
+class StubTMDBHandler(BaseHTTPRequestHandler):
+    """
+    Local stand-in of TMDB serving movies changes and details.
+    """
+    changed_ids = ()
+    # ids answered with TMDB error and with server error
+    missing_ids = ()
+    broken_ids = ()
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.requests.append((url.path, query))
+        status = 200
+
+        if url.path == '/movie/changes':
+            body = {
+                'results': [{'id': movie_id, 'adult': False} for movie_id in self.changed_ids],
+                'page': 1,
+                'total_pages': 1,
+            }
+        elif re.fullmatch(r'/movie/\d+', url.path):
+            movie_id = int(url.path.rsplit('/', 1)[1])
+            language = query['language']
+
+            if movie_id in self.missing_ids:
+                status = 404
+                body = {'success': False, 'status_code': 34, 'status_message': 'Not found.'}
+            elif movie_id in self.broken_ids:
+                status = 500
+                body = None
+            else:
+                body = {
+                    'id': movie_id,
+                    'title': f'Title {movie_id} {language}',
+                    'original_title': f'Original {movie_id}',
+                    'overview': f'Overview {movie_id} {language}',
+                    'vote_average': 7.5,
+                    'vote_count': 1000,
+                    'popularity': 10.0,
+                    'release_date': '2020-01-01',
+                    'genres': [{'id': 28, 'name': 'Action'}],
+                }
+        else:
+            status = 404
+            body = {'success': False, 'status_message': 'Unknown path.'}
+
+        data = json.dumps(body).encode() if body is not None else b'Server error'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class SyncChangesTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubTMDBHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        host, port = self.server.server_address
+        self.client = TMDBClient(
+            base_url=f'http://{host}:{port}',
+            timeout=5,
+            pool_size=4,
+            retries=0,
+            api_key='test'
+        )
+        StubTMDBHandler.changed_ids = (1, 2, 3, 4)
+        StubTMDBHandler.missing_ids = (4,)
+        StubTMDBHandler.broken_ids = ()
+        StubTMDBHandler.requests = []
+
+        Movie.objects.bulk_create([
+            Movie(id=1, original_title='Old 1'),
+            Movie(id=2, original_title='Old 2'),
+            Movie(id=4, original_title='Old 4'),
+        ])
+        MovieTranslation.objects.bulk_create([
+            MovieTranslation(movie_id=1, language='en', title='Old 1 en'),
+            MovieTranslation(movie_id=1, language='uk', title='Old 1 uk'),
+        ])
+
+    def test_sync_upserts_changed_catalog_movies(self):
+        since = timezone.now() - timedelta(days=2)
+        reports = []
+
+        stats = sync_changes(
+            since=since,
+            workers=2,
+            batch_size=2,
+            client=self.client,
+            progress=lambda stats: reports.append((stats.fetched, stats.elapsed))
+        )
+
+        # movie 3 isn't in the catalog, movie 4 is removed from TMDB
+        self.assertEqual(stats.changed, 4)
+        self.assertEqual(stats.fetched, 3)
+        self.assertEqual(stats.skipped, 1)
+        self.assertEqual(stats.failed, 0)
+        self.assertFalse(Movie.objects.filter(id=3).exists())
+        self.assertEqual(Movie.objects.get(id=1).original_title, 'Original 1')
+        self.assertEqual(Movie.objects.get(id=4).original_title, 'Old 4')
+        self.assertEqual(
+            set(MovieTranslation.objects.values_list('movie_id', 'language', 'title')),
+            {
+                (1, 'en', 'Title 1 en'),
+                (1, 'uk', 'Title 1 uk'),
+                (2, settings.LANGUAGE_CODE, f'Title 2 {settings.LANGUAGE_CODE}'),
+            }
+        )
+        self.assertEqual(list(Movie.objects.get(id=2).genres.values_list('id', flat=True)), [28])
+
+        watermark = CatalogSync.objects.get(name='movies').watermark
+        self.assertLessEqual(timezone.now() - watermark, timedelta(minutes=1))
+        self.assertAlmostEqual(stats.lag, (watermark - since).total_seconds(), delta=1)
+        self.assertAlmostEqual(stats.lag, timedelta(days=2).total_seconds(), delta=60)
+
+        # every batch of 2 movies is reported
+        self.assertEqual(len(reports), 2)
+        self.assertEqual(reports[-1][0], 3)
+        self.assertGreater(stats.elapsed, 0)
+
+    def test_sync_continues_from_watermark(self):
+        watermark = timezone.now() - timedelta(days=20)
+        CatalogSync.objects.create(name='movies', watermark=watermark)
+
+        stats = sync_changes(client=self.client)
+
+        # changes are asked by periods of up to 14 days
+        periods = [
+            (query['start_date'], query['end_date'])
+            for path, query in StubTMDBHandler.requests
+            if path == '/movie/changes'
+        ]
+        self.assertEqual(len(periods), 2)
+        self.assertEqual(periods[0][0], watermark.date().isoformat())
+        self.assertEqual(periods[-1][1], timezone.now().date().isoformat())
+        self.assertAlmostEqual(stats.lag, timedelta(days=20).total_seconds(), delta=60)
+        self.assertGreater(CatalogSync.objects.get(name='movies').watermark, watermark)
+
+    def test_failed_sync_keeps_watermark(self):
+        watermark = timezone.now() - timedelta(days=1)
+        CatalogSync.objects.create(name='movies', watermark=watermark)
+        StubTMDBHandler.broken_ids = (2,)
+
+        stats = sync_changes(client=self.client)
+
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.fetched, 2)
+        self.assertEqual(CatalogSync.objects.get(name='movies').watermark, watermark)
+
+    def test_command_reports_lag_and_throughput(self):
+        out = StringIO()
+
+        with mock.patch('apps.bot.tmdb.sync.get_client', return_value=self.client):
+            call_command('sync_tmdb_changes', '--days', '2', '--batch-size', '10', stdout=out)
+
+        output = out.getvalue()
+        self.assertRegex(output, r'Lag 48\.0h, changed 4, fetched 3 \(\d+\.\d/s\), skipped 1, failed 0')
+        self.assertIn('Sync is finished.', output)
+        self.assertTrue(CatalogSync.objects.filter(name='movies').exists())
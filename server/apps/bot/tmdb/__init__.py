@@ -0,0 +1,5 @@
+from .cache import *
+from .client import *
+from .genres import *
+from .records import *
+from .wrapper import *
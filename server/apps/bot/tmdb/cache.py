@@ -0,0 +1,223 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .flights import SingleFlight, flights
+from .records import RECORDS_VERSION
+from ..utils import closing_connections, get_executor
+
+__all__ = (
+    'ResponseCache',
+    'response_cache'
+)
+
+# (response, fresh until timestamp)
+Entry = Tuple[Dict, float]
+
+
+class ResponseCache:
+    """
+    Two tiers cache of TMDB responses.
+
+    Small in-process LRU sits in front of the Django cache, which is shared
+    between processes. Every endpoint has its own TTL, endpoints without TTL
+    aren't cached at all. Once TTL is passed entry is still served for
+    `stale_ttl` seconds while fresh response is fetched in background.
+
+    Concurrent fetches of the same response are coalesced by `flights`,
+    including ones of endpoints which aren't cached.
+    """
+    def __init__(
+            self,
+            *,
+            ttls: Dict[str, int],
+            stale_ttl: int,
+            local_size: int,
+            cache_alias: str = 'default',
+            refresh_workers: int = 2,
+            version: int = 1,
+            flights: 'SingleFlight' = None
+    ):
+        self.ttls = ttls
+        self.stale_ttl = stale_ttl
+        self.local_size = local_size
+        self.cache_alias = cache_alias
+        self.refresh_workers = refresh_workers
+        self.version = version
+        self.flights = flights or SingleFlight()
+        self.local: 'OrderedDict[str, Entry]' = OrderedDict()
+        self.counters: Dict[str, int] = dict.fromkeys(
+            (
+                'local_hits',
+                'shared_hits',
+                'stale_hits',
+                'misses',
+                'refreshes',
+                'refresh_errors',
+            ),
+            0
+        )
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_key(self, endpoint: str, language: str, params: Dict = None) -> str:
+        params = urlencode(sorted((params or {}).items()))
+        digest = hashlib.md5(params.encode()).hexdigest()
+        return f'tmdb:response:v{self.version}:{endpoint}:{language}:{digest}'
+
+    def get_or_fetch(
+            self,
+            *,
+            endpoint: str,
+            language: str,
+            params: Dict,
+            fetch: Callable[[], Dict]
+    ) -> Dict:
+        ttl = self.ttls.get(endpoint)
+        key = self.get_key(endpoint, language, params)
+
+        if not ttl:
+            return self.flights.do(key, fetch)
+
+        now = time.time()
+        entry = self._get_local(key)
+
+        if entry is not None:
+            self._count('local_hits')
+        else:
+            entry = self.cache.get(key)
+
+            if entry is not None:
+                self._count('shared_hits')
+                self._set_local(key, entry)
+
+        if entry is None:
+            self._count('misses')
+            return self.flights.do(
+                key,
+                lambda: self._fetch(key, ttl, fetch),
+                check=lambda: self._get_shared(key)
+            )
+
+        data, fresh_until = entry
+
+        if fresh_until < now:
+            self._count('stale_hits')
+            self._refresh(key, ttl, fetch)
+
+        return data
+
+    def invalidate(self, *, endpoint: str, language: str, params: Dict = None):
+        key = self.get_key(endpoint, language, params)
+
+        with self._lock:
+            self.local.pop(key, None)
+
+        self.cache.delete(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+            counters['local_size'] = len(self.local)
+
+        lookups = (
+            counters['local_hits']
+            + counters['shared_hits']
+            + counters['misses']
+        )
+        hits = counters['local_hits'] + counters['shared_hits']
+        counters['hit_ratio'] = round(hits / lookups, 3) if lookups else 0
+        return counters
+
+    def _fetch(self, key: str, ttl: int, fetch: Callable[[], Dict]) -> Dict:
+        data = fetch()
+        entry = (data, time.time() + ttl)
+        self.cache.set(key, entry, timeout=ttl + self.stale_ttl)
+        self._set_local(key, entry)
+        return data
+
+    def _refresh(self, key: str, ttl: int, fetch: Callable[[], Dict]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+
+            self._refreshing.add(key)
+
+        # * refreshed responses are saved to the catalog
+        @closing_connections
+        def refresh():
+            try:
+                self.flights.do(
+                    key,
+                    lambda: self._fetch(key, ttl, fetch),
+                    check=lambda: self._get_shared(key, fresh=True)
+                )
+            except Exception as e:
+                print(f"Can't refresh TMDB response {key}. Reason: {e}")
+                self._count('refresh_errors')
+            else:
+                self._count('refreshes')
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        get_executor('tmdb-refresh', self.refresh_workers).submit(refresh)
+
+    def _get_shared(self, key: str, fresh: bool = False) -> Optional[Dict]:
+        """
+        Returns response put to the Django cache by another process.
+        """
+        entry = self.cache.get(key)
+
+        if entry is None or (fresh and entry[1] < time.time()):
+            return None
+
+        self._set_local(key, entry)
+        return entry[0]
+
+    def _get_local(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self.local.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[1] + self.stale_ttl < time.time():
+                del self.local[key]
+                return None
+
+            self.local.move_to_end(key)
+            return entry
+
+    def _set_local(self, key: str, entry: Entry):
+        with self._lock:
+            self.local[key] = entry
+            self.local.move_to_end(key)
+
+            while len(self.local) > self.local_size:
+                self.local.popitem(last=False)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+
+response_cache = ResponseCache(
+    ttls=settings.TMDB_CACHE_TTLS,
+    stale_ttl=settings.TMDB_CACHE_STALE_TTL,
+    local_size=settings.TMDB_CACHE_LOCAL_SIZE,
+    cache_alias=settings.TMDB_CACHE_ALIAS,
+    # * lists are cached as serialized movie records
+    version=RECORDS_VERSION,
+    flights=flights,
+)
@@ -0,0 +1,340 @@
+import hashlib
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from shared.db import bulk_upsert
+
+from ..models import CatalogPage, Genre, GenreTranslation, Movie, MovieTranslation
+
+__all__ = (
+    'save_movies',
+    'save_export_movies',
+    'save_genres',
+    'get_movies',
+    'get_movie',
+    'save_page',
+    'get_page',
+    'prune_pages',
+    'discover_movies',
+)
+
+# Movies per page of catalog results, the same as TMDB has
+PAGE_SIZE = 20
+
+MOVIE_FIELDS = (
+    'original_title',
+    'original_language',
+    'release_date',
+    'vote_average',
+    'vote_count',
+    'popularity',
+    'adult',
+    'backdrop_path',
+    'poster_path',
+    'synced_at',
+)
+
+
+def get_genre_ids(item: Dict) -> List[int]:
+    # * lists have genres ids, while movie details have genres objects
+    if 'genre_ids' in item:
+        return list(item['genre_ids'] or [])
+
+    return [genre['id'] for genre in item.get('genres') or []]
+
+
+@transaction.atomic
+def save_movies(items: Iterable[Dict], *, language: str) -> int:
+    """
+    Creates or refreshes catalog movies from TMDB results.
+    """
+    items = {item['id']: item for item in items if item.get('id')}
+
+    if not items:
+        return 0
+
+    now = timezone.now()
+    bulk_upsert(
+        Movie,
+        (
+            {
+                'id': movie_id,
+                'original_title': item.get('original_title') or '',
+                'original_language': item.get('original_language') or '',
+                'release_date': parse_date(item.get('release_date') or ''),
+                'vote_average': item.get('vote_average') or 0,
+                'vote_count': item.get('vote_count') or 0,
+                'popularity': item.get('popularity') or 0,
+                'adult': bool(item.get('adult')),
+                'backdrop_path': item.get('backdrop_path') or '',
+                'poster_path': item.get('poster_path') or '',
+                'synced_at': now,
+            }
+            for movie_id, item in items.items()
+        ),
+        unique_fields=['id'],
+        update_fields=MOVIE_FIELDS
+    )
+    bulk_upsert(
+        MovieTranslation,
+        (
+            {
+                'movie': movie_id,
+                'language': language,
+                'title': item.get('title') or '',
+                'overview': item.get('overview') or '',
+                'synced_at': now,
+            }
+            for movie_id, item in items.items()
+        ),
+        unique_fields=['movie', 'language'],
+        update_fields=['title', 'overview', 'synced_at']
+    )
+
+    genres = {
+        movie_id: get_genre_ids(item)
+        for movie_id, item in items.items()
+    }
+    MovieGenre = Movie.genres.through
+    Genre.objects.bulk_create(
+        [Genre(id=genre_id) for genre_id in set().union(*genres.values())],
+        ignore_conflicts=True
+    )
+    MovieGenre.objects.filter(movie_id__in=list(genres)).delete()
+    MovieGenre.objects.bulk_create(
+        [
+            MovieGenre(movie_id=movie_id, genre_id=genre_id)
+            for movie_id, genre_ids in genres.items()
+            for genre_id in genre_ids
+        ],
+        ignore_conflicts=True
+    )
+
+    return len(items)
+
+
+def save_export_movies(items: Iterable[Dict], *, batch_size: int = 1000) -> int:
+    """
+    Creates or updates catalog movies from TMDB daily ids export items.
+
+    Export has only a few fields, other data of existing movies is kept.
+    """
+    return bulk_upsert(
+        Movie,
+        (
+            {
+                'id': item['id'],
+                'original_title': item.get('original_title') or '',
+                'popularity': item.get('popularity') or 0,
+                'adult': bool(item.get('adult')),
+            }
+            for item in items
+        ),
+        unique_fields=['id'],
+        update_fields=['original_title', 'popularity', 'adult'],
+        batch_size=batch_size
+    )
+
+
+@transaction.atomic
+def save_genres(items: Iterable[Dict], *, language: str) -> int:
+    items = {item['id']: item['name'] for item in items}
+    Genre.objects.bulk_create(
+        [Genre(id=genre_id) for genre_id in items],
+        ignore_conflicts=True
+    )
+    return bulk_upsert(
+        GenreTranslation,
+        (
+            {'genre': genre_id, 'language': language, 'name': name}
+            for genre_id, name in items.items()
+        ),
+        unique_fields=['genre', 'language'],
+        update_fields=['name']
+    )
+
+
+def get_queryset(language: str):
+    return (
+        Movie.objects
+        .prefetch_related(
+            Prefetch(
+                'translations',
+                queryset=MovieTranslation.objects.filter(language=language),
+                to_attr='localized'
+            ),
+            'genres'
+        )
+    )
+
+
+def to_item(movie: 'Movie') -> Dict:
+    """
+    Converts catalog movie to the TMDB results item.
+    """
+    translation = movie.localized[0] if movie.localized else None
+    return {
+        'id': movie.id,
+        'title': translation.title if translation else movie.original_title,
+        'original_title': movie.original_title,
+        'original_language': movie.original_language,
+        'overview': translation.overview if translation else '',
+        'release_date': movie.release_date.isoformat() if movie.release_date else '',
+        'vote_average': movie.vote_average,
+        'vote_count': movie.vote_count,
+        'popularity': movie.popularity,
+        'adult': movie.adult,
+        'backdrop_path': movie.backdrop_path or None,
+        'poster_path': movie.poster_path or None,
+        'genre_ids': [genre.id for genre in movie.genres.all()],
+    }
+
+
+def get_movies(movie_ids: Iterable[int], *, language: str, fresh: bool = True) -> Dict[int, Dict]:
+    """
+    Returns catalog movies translated to the language by ids.
+
+    With `fresh` only movies synced within `TMDB_CATALOG_TTL`
+    seconds and having the translation are returned.
+    """
+    queryset = get_queryset(language).filter(id__in=list(movie_ids))
+
+    if fresh:
+        synced_after = timezone.now() - timedelta(seconds=settings.TMDB_CATALOG_TTL)
+        queryset = queryset.filter(
+            translations__language=language,
+            translations__synced_at__gte=synced_after
+        )
+
+    return {movie.id: to_item(movie) for movie in queryset}
+
+
+def get_movie(movie_id: int, *, language: str, fresh: bool = True) -> Optional[Dict]:
+    return get_movies([movie_id], language=language, fresh=fresh).get(movie_id)
+
+
+def get_params_hash(params: Dict = None) -> str:
+    params = urlencode(sorted((params or {}).items()))
+    return hashlib.md5(params.encode()).hexdigest()
+
+
+def save_page(endpoint: str, params: Dict, data: Dict, *, language: str):
+    """
+    Remembers movies of TMDB list response in order,
+    movies themselves are saved by `save_movies`.
+    """
+    CatalogPage.objects.update_or_create(
+        endpoint=endpoint,
+        language=language,
+        params_hash=get_params_hash(params),
+        defaults={
+            'movie_ids': [item['id'] for item in data.get('results', []) if item.get('id')],
+            'total_pages': data.get('total_pages') or 1,
+            'synced_at': timezone.now(),
+        }
+    )
+
+
+def get_page(endpoint: str, params: Dict, *, language: str, ttl: int = None) -> Optional[Dict]:
+    """
+    Returns TMDB list response rebuilt from the catalog, or `None` if the
+    page wasn't saved, is older than `ttl` seconds or lost some movies.
+    """
+    queryset = CatalogPage.objects.filter(
+        endpoint=endpoint,
+        language=language,
+        params_hash=get_params_hash(params)
+    )
+
+    if ttl is not None:
+        queryset = queryset.filter(
+            synced_at__gte=timezone.now() - timedelta(seconds=ttl)
+        )
+
+    page = queryset.first()
+
+    if page is None:
+        return None
+
+    movies = get_movies(page.movie_ids, language=language, fresh=False)
+
+    if len(movies) < len(page.movie_ids):
+        return None
+
+    return {
+        'page': (params or {}).get('page', 1),
+        'total_pages': page.total_pages,
+        'results': [movies[movie_id] for movie_id in page.movie_ids],
+    }
+
+
+def prune_pages(*, max_age: int) -> int:
+    """
+    Deletes pages saved more than `max_age` seconds ago:
+    every discover params set leaves its own pages.
+    """
+    deleted, _ = CatalogPage.objects.filter(
+        synced_at__lt=timezone.now() - timedelta(seconds=max_age)
+    ).delete()
+    return deleted
+
+
+def discover_movies(params: Dict, *, language: str) -> Dict:
+    """
+    Returns page of catalog movies filtered by TMDB discover params,
+    shaped as a TMDB response.
+    """
+    queryset = get_queryset(language).filter(translations__language=language)
+    filters = {
+        'vote_average.gte': 'vote_average__gte',
+        'vote_count.gte': 'vote_count__gte',
+        'primary_release_date.gte': 'release_date__gte',
+        'primary_release_date.lte': 'release_date__lte',
+    }
+
+    for param, lookup in filters.items():
+        if params.get(param) is not None:
+            queryset = queryset.filter(**{lookup: params[param]})
+
+    if not params.get('include_adult'):
+        queryset = queryset.filter(adult=False)
+
+    # * TMDB treats comma separated genres as all of them
+    for genre_id in str(params.get('with_genres') or '').split(','):
+        if genre_id:
+            queryset = queryset.filter(genres__id=int(genre_id))
+
+    sort_by = params.get('sort_by', 'popularity.desc')
+    field, _, direction = sort_by.partition('.')
+    ordering = {
+        'popularity': 'popularity',
+        'vote_average': 'vote_average',
+        'vote_count': 'vote_count',
+        'release_date': 'release_date',
+        'primary_release_date': 'release_date',
+    }.get(field, 'popularity')
+    queryset = queryset.order_by(
+        ordering if direction == 'asc' else f'-{ordering}',
+        'id'
+    )
+
+    page = max(int(params.get('page', 1)), 1)
+    total_results = queryset.count()
+    offset = (page - 1) * PAGE_SIZE
+
+    return {
+        'page': page,
+        'total_pages': max((total_results + PAGE_SIZE - 1) // PAGE_SIZE, 1),
+        'total_results': total_results,
+        'results': [
+            to_item(movie)
+            for movie in queryset[offset:offset + PAGE_SIZE]
+        ],
+    }
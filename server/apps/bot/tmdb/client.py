@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.dispatch import receiver
+
+import requests
+from constance import config
+from constance.signals import config_updated
+from requests.adapters import HTTPAdapter
+from tmdbv3api.exceptions import TMDbException
+from urllib3.util.retry import Retry
+
+__all__ = (
+    'TMDBClient',
+    'get_client'
+)
+
+
+class TMDBClient:
+    """
+    Process wide TMDB API client.
+
+    Keeps one session with a pool of keep-alive connections, so TCP/TLS
+    handshake is paid once per connection, not once per request.
+    Client holds no per-request state: language is passed with every call,
+    so it's safe to share it between threads.
+
+    API key is re-read from constance every `api_key_ttl` seconds,
+    so a key changed by another process is picked up too,
+    unless the client is given its own `api_key`.
+    """
+    def __init__(
+            self,
+            *,
+            base_url: str,
+            timeout: float,
+            pool_size: int,
+            retries: int,
+            api_key: str = None,
+            api_key_ttl: float = 60
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.api_key_ttl = api_key_ttl
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.fixed_api_key = api_key
+        self._api_key: Optional[str] = None
+        self._api_key_read_at = 0.0
+
+    @property
+    def api_key(self) -> str:
+        if self.fixed_api_key is not None:
+            return self.fixed_api_key
+
+        now = time.monotonic()
+
+        if self._api_key is None or now - self._api_key_read_at >= self.api_key_ttl:
+            self._api_key = config.MOVIE_DB_API_KEY
+            self._api_key_read_at = now
+
+        return self._api_key
+
+    def reset_api_key(self):
+        self._api_key = None
+
+    def get(
+            self,
+            path: str,
+            params: Dict = None,
+            *,
+            language: str = None
+    ) -> Dict:
+        api_key = self.api_key
+
+        if not api_key:
+            raise TMDbException('No API key found.')
+
+        query = {
+            'api_key': api_key,
+            'language': language or settings.LANGUAGE_CODE,
+        }
+        query.update(params or {})
+
+        response = self.session.get(
+            f'{self.base_url}{path}',
+            params=query,
+            timeout=self.timeout
+        )
+        data = response.json()
+
+        if data.get('success') is False:
+            raise TMDbException(data.get('status_message'))
+
+        if 'errors' in data:
+            raise TMDbException(data['errors'])
+
+        return data
+
+
+_client: Optional['TMDBClient'] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> 'TMDBClient':
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TMDBClient(
+                    base_url=settings.TMDB_API_URL,
+                    timeout=settings.TMDB_TIMEOUT,
+                    pool_size=settings.TMDB_POOL_SIZE,
+                    retries=settings.TMDB_RETRIES,
+                    api_key_ttl=settings.TMDB_API_KEY_TTL,
+                )
+
+    return _client
+
+
+# * the key is changed in this process right away, in others within the TTL
+@receiver(config_updated)
+def reset_client_api_key(sender, key, old_value, new_value, **kwargs):
+    if key == 'MOVIE_DB_API_KEY' and _client is not None:
+        _client.reset_api_key()
@@ -0,0 +1,159 @@
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+__all__ = (
+    'SingleFlight',
+    'flights',
+)
+
+
+class Flight:
+    """
+    Call in progress, waited for by the threads asking for the same key.
+    """
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one.
+
+    The first thread asking for a key makes the call, threads asking for
+    the same key meanwhile wait for it and get its result or its error.
+    They never call on their own: the call is bounded by its own timeouts
+    and the cross-process wait, so they'd only add a burst of equal calls.
+
+    With `shared` the call is also coalesced between processes: the caller
+    takes a lock in the Django cache for `lock_timeout` seconds, callers
+    of other processes poll their `check` until it returns the result put
+    in the cache by the lock holder. Once the lock is released without
+    a result or isn't released in time they make the call themselves.
+    Lock holds a token of its holder, so a holder whose lock has expired
+    doesn't release the lock taken by another process since then.
+    """
+    def __init__(
+            self,
+            *,
+            shared: bool = False,
+            cache_alias: str = 'default',
+            lock_timeout: int = 10,
+            poll_interval: float = 0.05
+    ):
+        self.shared = shared
+        self.cache_alias = cache_alias
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.counters: Dict[str, int] = dict.fromkeys(
+            (
+                'calls',
+                'coalesced',
+                'shared_waits',
+                'shared_hits',
+                'shared_timeouts',
+            ),
+            0
+        )
+        self._flights: Dict[Hashable, 'Flight'] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def do(
+            self,
+            key: Hashable,
+            call: Callable[[], Any],
+            *,
+            check: Callable[[], Any] = None
+    ) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+
+            if is_leader:
+                flight = self._flights[key] = Flight()
+                self.counters['calls'] += 1
+            else:
+                self.counters['coalesced'] += 1
+
+        if not is_leader:
+            flight.done.wait()
+
+            if flight.error is not None:
+                raise flight.error
+
+            return flight.result
+
+        try:
+            flight.result = self._call(key, call, check)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+            flight.done.set()
+
+        return flight.result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.counters, 'in_flight': len(self._flights)}
+
+    def _call(self, key: Hashable, call: Callable[[], Any], check: Optional[Callable[[], Any]]) -> Any:
+        if not self.shared or check is None:
+            return call()
+
+        lock_key = f'{key}:flight'
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        is_waiting = False
+
+        while not self.cache.add(lock_key, token, timeout=self.lock_timeout):
+            if not is_waiting:
+                is_waiting = True
+                self._count('shared_waits')
+
+            time.sleep(self.poll_interval)
+            result = check()
+
+            if result is not None:
+                self._count('shared_hits')
+                return result
+
+            if time.monotonic() >= deadline:
+                self._count('shared_timeouts')
+                return call()
+
+        try:
+            # * the previous holder may have put the result just before release
+            result = check() if is_waiting else None
+            return call() if result is None else result
+        finally:
+            # * Django cache has no compare-and-delete, the lock can be lost
+            # * only if it expires right between these calls
+            if self.cache.get(lock_key) == token:
+                self.cache.delete(lock_key)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+
+flights = SingleFlight(
+    shared=settings.TMDB_SINGLE_FLIGHT_SHARED,
+    cache_alias=settings.TMDB_CACHE_ALIAS,
+    lock_timeout=settings.TMDB_SINGLE_FLIGHT_LOCK_TIMEOUT,
+)
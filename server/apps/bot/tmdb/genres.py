@@ -0,0 +1,128 @@
+import time
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .flights import flights
+from ..models import GenreTranslation
+from ..utils import PeriodicTask, closing_connections, get_executor
+
+__all__ = (
+    'GenresMap',
+    'GenresTable',
+    'genres_table',
+)
+
+
+class GenresMap(dict):
+    """
+    Genres names by ids, unknown genres have empty names.
+    """
+    def __missing__(self, genre_id) -> str:
+        return ''
+
+
+class GenresTable:
+    """
+    In-process genres names of every language.
+
+    Maps are loaded for `languages` in background once `start` is called
+    and reloaded every `refresh_interval` seconds. A map is replaced as
+    a whole and never changed in place, so lookups need no locks.
+    Map of a language which isn't loaded yet is loaded on the first lookup.
+
+    Once TMDB fails, the previous or the catalog map is kept (even empty)
+    and TMDB is asked again in background not sooner than `retry_interval`
+    seconds, so lookups during an outage don't wait for TMDB each time.
+    """
+    def __init__(
+            self,
+            *,
+            languages: Iterable[str],
+            refresh_interval: float,
+            retry_interval: float = 60
+    ):
+        self.languages = tuple(languages)
+        self.retry_interval = retry_interval
+        self.maps: Dict[str, 'GenresMap'] = {}
+        # * languages those maps failed to load from TMDB, by retry time
+        self._retry_at: Dict[str, float] = {}
+        self._refresher = PeriodicTask(
+            self.refresh,
+            interval=refresh_interval,
+            name='genres-refresh'
+        )
+
+    def start(self):
+        if self._refresher.start():
+            get_executor('genres-warm', 1).submit(self.refresh)
+
+    def get(self, language: Optional[str] = None) -> 'GenresMap':
+        language = language or settings.LANGUAGE_CODE
+        genres = self.maps.get(language)
+
+        if genres is None:
+            # * concurrent first lookups of a language share one load
+            genres = flights.do(
+                ('genres_table', language),
+                lambda: self.load_missing(language)
+            )
+        elif self._retry_at.get(language, float('inf')) <= time.monotonic():
+            self._retry_at[language] = time.monotonic() + self.retry_interval
+            get_executor('genres-warm', 1).submit(self.reload, language)
+
+        return genres
+
+    def load_missing(self, language: str) -> 'GenresMap':
+        genres = self.maps.get(language)
+
+        if genres is None:
+            genres = self.maps[language] = self.load(language)
+
+        return genres
+
+    @closing_connections
+    def reload(self, language: str):
+        self.maps[language] = self.load(language, fallback=self.maps.get(language))
+
+    def refresh(self):
+        for language in set(self.languages) | set(self.maps):
+            self.maps[language] = self.load(language, fallback=self.maps.get(language))
+
+        close_old_connections()
+
+    def load(self, language: str, fallback: 'GenresMap' = None) -> 'GenresMap':
+        from .wrapper import TMDBWrapper
+
+        try:
+            genres = TMDBWrapper(language).get_movies_genres()
+        except Exception as e:
+            print(f"Can't load {language} genres. Reason: {e}")
+            self._retry_at[language] = time.monotonic() + self.retry_interval
+        else:
+            self._retry_at.pop(language, None)
+            return GenresMap(
+                (genre.id, str(genre.name).title())
+                for genre in genres
+            )
+
+        if fallback:
+            return fallback
+
+        # * names saved to the catalog from earlier responses
+        return GenresMap(
+            (genre_id, name.title())
+            for genre_id, name in (
+                GenreTranslation.objects
+                .filter(language=language)
+                .values_list('genre_id', 'name')
+            )
+        )
+
+
+genres_table = GenresTable(
+    languages=[language for language, _ in settings.LANGUAGES],
+    refresh_interval=settings.TMDB_GENRES_REFRESH_INTERVAL,
+    retry_interval=settings.TMDB_GENRES_RETRY_INTERVAL,
+)
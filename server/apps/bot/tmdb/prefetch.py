@@ -0,0 +1,71 @@
+import threading
+from typing import Callable, Dict, Hashable, Set
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from ..utils import get_executor
+
+__all__ = (
+    'Prefetcher',
+    'prefetcher',
+)
+
+
+class Prefetcher:
+    """
+    Runs TMDB fetches in background, so their responses land in the cache
+    before they're needed.
+
+    At most `max_concurrent` fetches run at once, others are dropped
+    instead of queued: a late prefetch is useless. The same fetch isn't
+    scheduled while it runs.
+    """
+    def __init__(self, *, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.counters: Dict[str, int] = dict.fromkeys(
+            ('scheduled', 'busy', 'duplicated', 'errors'),
+            0
+        )
+        self._running: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def schedule(self, key: Hashable, fetch: Callable[[], object]) -> bool:
+        with self._lock:
+            if key in self._running:
+                self.counters['duplicated'] += 1
+                return False
+
+            if len(self._running) >= self.max_concurrent:
+                self.counters['busy'] += 1
+                return False
+
+            self._running.add(key)
+            self.counters['scheduled'] += 1
+
+        def run():
+            try:
+                fetch()
+            except Exception as e:
+                print(f"Can't prefetch {key}. Reason: {e}")
+
+                with self._lock:
+                    self.counters['errors'] += 1
+            finally:
+                # * fetches read the catalog
+                close_old_connections()
+
+                with self._lock:
+                    self._running.discard(key)
+
+        get_executor('tmdb-prefetch', self.max_concurrent).submit(run)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.counters, 'running': len(self._running)}
+
+
+prefetcher = Prefetcher(
+    max_concurrent=settings.TMDB_PREFETCH_MAX_CONCURRENT,
+)
@@ -0,0 +1,197 @@
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from ..models import MovieTranslation
+from ..utils import PeriodicTask, get_executor
+
+__all__ = (
+    'PrefixIndex',
+    'prefix_index',
+)
+
+
+def normalize(text: str) -> str:
+    return ' '.join(re.findall(r'\w+', text.casefold()))
+
+
+class Titles:
+    """
+    Sorted titles keys of one language in compact parallel arrays.
+
+    Every title has a key per word, so a prefix matches beginning
+    of any title word.
+    """
+    def __init__(self, entries: List[Tuple[str, float, int]], built_at: 'datetime'):
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.popularity = array('f', (popularity for _, popularity, _ in entries))
+        self.ids = array('L', (movie_id for _, _, movie_id in entries))
+        self.built_at = built_at
+
+    def entries(self):
+        return zip(self.keys, self.popularity, self.ids)
+
+    def search(self, prefix: str, limit: int) -> List[int]:
+        start = bisect_left(self.keys, prefix)
+        # * keys starting with the prefix sort before the prefix followed by the max char
+        end = bisect_left(self.keys, prefix + '\U0010ffff', lo=start)
+        best = heapq.nlargest(
+            limit * 2,
+            range(start, end),
+            key=self.popularity.__getitem__
+        )
+        movie_ids = []
+
+        for position in best:
+            movie_id = self.ids[position]
+
+            if movie_id not in movie_ids:
+                movie_ids.append(movie_id)
+
+        return movie_ids[:limit]
+
+
+def get_title_entries(title: str, popularity: float, movie_id: int) -> List[Tuple[str, float, int]]:
+    key = normalize(title)
+    words = key.split(' ')
+    return [
+        (' '.join(words[position:]), popularity, movie_id)
+        for position in range(len(words))
+        if words[position]
+    ]
+
+
+class PrefixIndex:
+    """
+    In-process index of popular catalog titles by language
+    answering short inline queries without TMDB.
+
+    Index of a language is built in background on its first lookup, lookups
+    miss until it's ready. Every `refresh_interval` seconds titles synced
+    since the last build are merged into indexes.
+    """
+    def __init__(self, *, size: int, refresh_interval: float):
+        self.size = size
+        self.titles: Dict[str, 'Titles'] = {}
+        self._building = set()
+        self._lock = threading.Lock()
+        self._refresher = PeriodicTask(
+            self.refresh,
+            interval=refresh_interval,
+            name='prefix-index-refresh'
+        )
+
+    def search(self, query: str, *, language: str, limit: int = 20) -> Optional[List[int]]:
+        """
+        Returns ids of the most popular movies with a title word starting
+        with the query, or `None` if index of the language isn't built.
+        """
+        titles = self.titles.get(language)
+
+        if titles is None:
+            self.build_async(language)
+            return None
+
+        prefix = normalize(query)
+
+        if not prefix:
+            return []
+
+        return titles.search(prefix, limit)
+
+    def build_async(self, language: str):
+        with self._lock:
+            if language in self._building:
+                return
+
+            self._building.add(language)
+
+        get_executor('prefix-index', 1).submit(self.build, language)
+        self._refresher.start()
+
+    def build(self, language: str):
+        try:
+            built_at = timezone.now()
+            self.titles[language] = Titles(
+                self.get_entries(language),
+                built_at=built_at
+            )
+        except Exception as e:
+            print(f"Can't build titles prefix index. Reason: {e}")
+        finally:
+            close_old_connections()
+
+            with self._lock:
+                self._building.discard(language)
+
+    def refresh(self):
+        for language, titles in list(self.titles.items()):
+            built_at = timezone.now()
+            updated = self.get_entries(language, synced_after=titles.built_at)
+
+            if not updated:
+                continue
+
+            updated_ids = {movie_id for _, _, movie_id in updated}
+            entries = [
+                entry
+                for entry in titles.entries()
+                if entry[2] not in updated_ids
+            ]
+            entries.extend(updated)
+            # * the least popular titles are dropped to keep the size
+            self.titles[language] = Titles(
+                self.limit(entries),
+                built_at=built_at
+            )
+
+        close_old_connections()
+
+    def limit(self, entries: List[Tuple[str, float, int]]) -> List[Tuple[str, float, int]]:
+        popularity = {}
+
+        for _, movie_popularity, movie_id in entries:
+            popularity[movie_id] = movie_popularity
+
+        if len(popularity) <= self.size:
+            return entries
+
+        kept = set(heapq.nlargest(self.size, popularity, key=popularity.get))
+        return [entry for entry in entries if entry[2] in kept]
+
+    def get_entries(self, language: str, synced_after: 'datetime' = None) -> List[Tuple[str, float, int]]:
+        queryset = (
+            MovieTranslation.objects
+            .filter(language=language)
+            .exclude(title='')
+        )
+
+        if synced_after is not None:
+            queryset = queryset.filter(synced_at__gte=synced_after)
+
+        rows = (
+            queryset
+            .order_by('-movie__popularity')
+            .values_list('title', 'movie__popularity', 'movie_id')
+            [:self.size]
+        )
+        return [
+            entry
+            for title, popularity, movie_id in rows
+            for entry in get_title_entries(title, popularity, movie_id)
+        ]
+
+
+prefix_index = PrefixIndex(
+    size=settings.TMDB_PREFIX_INDEX_SIZE,
+    refresh_interval=settings.TMDB_PREFIX_INDEX_REFRESH_INTERVAL,
+)
@@ -0,0 +1,124 @@
+import heapq
+import math
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+from .records import MovieRecord
+
+__all__ = (
+    'get_profile',
+    'score_movies',
+    'rank_movies',
+)
+
+LN2 = math.log(2)
+
+
+def get_profile(name: str) -> Dict:
+    """
+    Returns ranking settings of the list type over the default ones.
+    """
+    profiles = settings.TMDB_RANKING_PROFILES
+    return {**profiles['default'], **profiles.get(name, {})}
+
+
+def get_release_day(release_date: str) -> Optional[int]:
+    # * TMDB dates are `YYYY-MM-DD`, other values are unknown dates
+    try:
+        return date.fromisoformat(release_date).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def is_candidate(movie: 'MovieRecord', profile: Dict) -> bool:
+    return (
+        movie.vote_average > profile['min_vote_average']
+        and movie.vote_count > profile['min_vote_count']
+        and (movie.backdrop_path or not profile['require_backdrop'])
+        and (movie.overview or not profile['require_overview'])
+    )
+
+
+def score_movies(movies: Sequence['MovieRecord'], profile: Dict) -> List[float]:
+    """
+    Returns scores of the movies, filtered out ones get `-inf`.
+
+    Score blends Bayesian weighted rating with popularity and recency:
+    rating of a movie with few votes is pulled to the mean rating
+    of the candidates, popularity is log-scaled to the most popular one,
+    recency halves every `recency_half_life` days since release.
+    """
+    passed = [is_candidate(movie, profile) for movie in movies]
+    candidates = [movie for movie, is_passed in zip(movies, passed) if is_passed]
+
+    if not candidates:
+        return [-math.inf] * len(movies)
+
+    prior_votes = profile['prior_votes']
+    mean_rating = sum(movie.vote_average for movie in candidates) / len(candidates)
+    max_popularity = max(
+        max(math.log1p(movie.popularity) for movie in candidates),
+        1e-9
+    )
+    today = date.today().toordinal()
+    half_life = profile['recency_half_life']
+    popularity_weight = profile['popularity_weight']
+    recency_weight = profile['recency_weight']
+    rating_weight = 1 - popularity_weight - recency_weight
+    scores = []
+
+    for movie, is_passed in zip(movies, passed):
+        if not is_passed:
+            scores.append(-math.inf)
+            continue
+
+        votes = movie.vote_count
+        weighted_rating = (
+            (votes * movie.vote_average + prior_votes * mean_rating)
+            / (votes + prior_votes)
+        ) / 10
+        popularity = math.log1p(movie.popularity) / max_popularity
+        release_day = get_release_day(movie.release_date)
+        recency = (
+            math.exp(-max(today - release_day, 0) * LN2 / half_life)
+            if release_day is not None
+            else 0
+        )
+        scores.append(
+            rating_weight * weighted_rating
+            + popularity_weight * popularity
+            + recency_weight * recency
+        )
+
+    return scores
+
+
+def rank_movies(
+        movies: Sequence['MovieRecord'],
+        *,
+        profile: str = 'default',
+        limit: int = None
+) -> List['MovieRecord']:
+    """
+    Filters candidates and returns top `limit` of them, the best first.
+
+    Equal scores keep the order of TMDB response.
+    """
+    if not movies:
+        return []
+
+    scores = score_movies(movies, get_profile(profile))
+    candidates = [
+        position
+        for position, score in enumerate(scores)
+        if score > -math.inf
+    ]
+
+    if limit is not None and limit < len(candidates):
+        best_first = heapq.nlargest(limit, candidates, key=scores.__getitem__)
+    else:
+        best_first = sorted(candidates, key=scores.__getitem__, reverse=True)
+
+    return [movies[position] for position in best_first]
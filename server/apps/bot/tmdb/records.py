@@ -0,0 +1,120 @@
+import marshal
+from typing import Dict, Iterable, List, Tuple
+
+__all__ = (
+    'MovieRecord',
+    'RECORDS_VERSION',
+)
+
+# Bumped once record fields change, so cached records of the previous
+# layout are never read
+RECORDS_VERSION = 2
+
+
+class MovieRecord:
+    """
+    Immutable movie with only fields the bot uses.
+
+    Unlike `AsObj` it keeps neither a dict nor the raw response, equal
+    records are ones of the same movie. Lists of records are serialized
+    with `marshal` as tuples of values.
+    """
+    __slots__ = (
+        'id',
+        'title',
+        'overview',
+        'vote_average',
+        'vote_count',
+        'popularity',
+        'release_date',
+        'genre_ids',
+        'backdrop_path',
+        'poster_path',
+    )
+
+    def __init__(
+            self,
+            id: int,
+            title: str = '',
+            overview: str = '',
+            vote_average: float = 0,
+            vote_count: int = 0,
+            popularity: float = 0,
+            release_date: str = '',
+            genre_ids: Tuple[int, ...] = (),
+            backdrop_path: str = None,
+            poster_path: str = None
+    ):
+        set_field = super().__setattr__
+        set_field('id', id)
+        set_field('title', title)
+        set_field('overview', overview)
+        set_field('vote_average', vote_average)
+        set_field('vote_count', vote_count)
+        set_field('popularity', popularity)
+        set_field('release_date', release_date)
+        set_field('genre_ids', tuple(genre_ids))
+        set_field('backdrop_path', backdrop_path)
+        set_field('poster_path', poster_path)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MovieRecord':
+        """
+        Builds record from TMDB results item or movie details.
+        """
+        genre_ids = data.get('genre_ids')
+
+        if genre_ids is None:
+            genre_ids = [genre['id'] for genre in data.get('genres') or []]
+
+        return cls(
+            id=data['id'],
+            title=data.get('title') or '',
+            overview=data.get('overview') or '',
+            vote_average=data.get('vote_average') or 0,
+            vote_count=data.get('vote_count') or 0,
+            popularity=data.get('popularity') or 0,
+            release_date=data.get('release_date') or '',
+            genre_ids=genre_ids,
+            backdrop_path=data.get('backdrop_path'),
+            poster_path=data.get('poster_path'),
+        )
+
+    def to_tuple(self) -> Tuple:
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    @classmethod
+    def dumps(cls, records: Iterable['MovieRecord']) -> bytes:
+        return marshal.dumps(
+            (RECORDS_VERSION, tuple(record.to_tuple() for record in records))
+        )
+
+    @classmethod
+    def loads(cls, data: bytes) -> List['MovieRecord']:
+        version, rows = marshal.loads(data)
+
+        if version != RECORDS_VERSION:
+            raise ValueError(f'Unknown movie records version {version}.')
+
+        return [cls(*row) for row in rows]
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Can't set attribute {name}, movie record is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Can't delete attribute {name}, movie record is immutable.")
+
+    def __eq__(self, other):
+        if not isinstance(other, MovieRecord):
+            return NotImplemented
+
+        return self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __reduce__(self):
+        return self.__class__, self.to_tuple()
+
+    def __repr__(self):
+        return f'<MovieRecord {self.id}: {self.title}>'
@@ -0,0 +1,79 @@
+import re
+from typing import Dict, List, Optional
+
+from django.db import DatabaseError, connections, router
+
+from . import catalog
+from ..models import MovieTranslation
+
+__all__ = (
+    'search_catalog',
+)
+
+# * a movie is found by its original title row or by the translation row
+SQLITE_QUERY = """
+    SELECT movie_id FROM bot_movie_search
+    WHERE bot_movie_search MATCH %s AND language IN (%s, '')
+    GROUP BY movie_id
+    ORDER BY MIN(rank)
+    LIMIT %s
+"""
+
+POSTGRESQL_QUERY = """
+    SELECT found.movie_id FROM (
+        SELECT m.id AS movie_id, similarity(m.original_title, %s) AS score
+        FROM bot_movie m
+        WHERE m.original_title %% %s
+        UNION ALL
+        SELECT t.movie_id, similarity(t.title, %s)
+        FROM bot_movietranslation t
+        WHERE t.language = %s AND t.title %% %s
+    ) found
+    JOIN bot_movie m ON m.id = found.movie_id
+    GROUP BY found.movie_id, m.popularity
+    ORDER BY MAX(found.score) DESC, m.popularity DESC
+    LIMIT %s
+"""
+
+
+def get_sqlite_match(query: str) -> str:
+    # * every word is a quoted prefix, so query syntax can't be injected
+    # * and partly typed inline queries still match
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_catalog(query: str, *, language: str, limit: int = 20) -> Optional[List[Dict]]:
+    """
+    Searches catalog movies by localized and original titles.
+
+    Movies are found by original titles even without translation
+    to the language, then their original titles are shown.
+
+    SQLite uses FTS5 index, PostgreSQL uses trigram indexes.
+    Returns `None` if database has no search index.
+    """
+    connection = connections[router.db_for_read(MovieTranslation)]
+
+    if connection.vendor == 'sqlite':
+        match = get_sqlite_match(query)
+
+        if not match:
+            return []
+
+        sql, params = SQLITE_QUERY, [match, language, limit]
+    elif connection.vendor == 'postgresql':
+        sql, params = POSTGRESQL_QUERY, [query, query, query, language, query, limit]
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            movie_ids = [row[0] for row in cursor.fetchall()]
+    except DatabaseError as e:
+        print(f"Can't search catalog. Reason: {e}")
+        return None
+
+    movies = catalog.get_movies(movie_ids, language=language, fresh=False)
+    return [movies[movie_id] for movie_id in movie_ids if movie_id in movies]
@@ -0,0 +1,152 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, DefaultDict, Dict, Iterable, List, Set, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from tmdbv3api.exceptions import TMDbException
+
+from . import catalog
+from .client import TMDBClient, get_client
+from ..entities import SyncStats
+from ..models import CatalogSync, Movie, MovieTranslation
+
+__all__ = (
+    'get_changed_movie_ids',
+    'sync_changes',
+)
+
+# TMDB accepts changes period up to 14 days
+MAX_CHANGES_PERIOD = timedelta(days=14)
+
+
+def get_changed_movie_ids(
+        *,
+        client: 'TMDBClient',
+        start: datetime,
+        end: datetime
+) -> Set[int]:
+    movie_ids = set()
+
+    while start < end:
+        period_end = min(start + MAX_CHANGES_PERIOD, end)
+        page = total_pages = 1
+
+        while page <= total_pages:
+            data = client.get(
+                '/movie/changes',
+                {
+                    'start_date': start.date().isoformat(),
+                    'end_date': period_end.date().isoformat(),
+                    'page': page,
+                }
+            )
+            movie_ids.update(item['id'] for item in data.get('results', []))
+            total_pages = data.get('total_pages', 1)
+            page += 1
+
+        start = period_end
+
+    return movie_ids
+
+
+def get_stale_translations(movie_ids: Iterable[int]) -> List[Tuple[int, str]]:
+    """
+    Returns (movie id, language) of catalog movies to refetch:
+    every stored translation, or default language for movies without them.
+    """
+    movie_ids = list(
+        Movie.objects
+        .filter(id__in=list(movie_ids))
+        .values_list('id', flat=True)
+    )
+    pairs = list(
+        MovieTranslation.objects
+        .filter(movie_id__in=movie_ids)
+        .values_list('movie_id', 'language')
+    )
+    translated = {movie_id for movie_id, _ in pairs}
+    pairs.extend(
+        (movie_id, settings.LANGUAGE_CODE)
+        for movie_id in movie_ids
+        if movie_id not in translated
+    )
+    return pairs
+
+
+def sync_changes(
+        *,
+        name: str = 'movies',
+        since: datetime = None,
+        workers: int = None,
+        batch_size: int = 500,
+        client: 'TMDBClient' = None,
+        progress: Callable[['SyncStats'], None] = None
+) -> 'SyncStats':
+    """
+    Refetches catalog movies changed on TMDB since the stored watermark.
+
+    Only movies present in the catalog are fetched, with at most `workers`
+    concurrent requests, and saved by batches. Watermark is moved only
+    once all changes are fetched, so sync failed because of network errors
+    is repeated next time.
+    """
+    client = client or get_client()
+    started_at = time.monotonic()
+    end = timezone.now()
+    state = CatalogSync.objects.filter(name=name).first()
+
+    if since is None:
+        since = state.watermark if state else end - timedelta(days=1)
+
+    stats = SyncStats(lag=(end - since).total_seconds())
+    changed = get_changed_movie_ids(client=client, start=since, end=end)
+    pairs = get_stale_translations(changed)
+    stats.changed = len(pairs)
+    # * pool of the run, so every run gets its own amount of workers
+    with ThreadPoolExecutor(
+            max_workers=workers or settings.TMDB_FETCH_WORKERS,
+            thread_name_prefix=f'tmdb-sync-{name}'
+    ) as executor:
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start:start + batch_size]
+            futures = [
+                executor.submit(
+                    client.get,
+                    f'/movie/{movie_id}',
+                    language=language
+                )
+                for movie_id, language in batch
+            ]
+            items: DefaultDict[str, List[Dict]] = defaultdict(list)
+
+            for (movie_id, language), future in zip(batch, futures):
+                try:
+                    items[language].append(future.result())
+                except TMDbException as e:
+                    # * e.g. movie is removed from TMDB, retrying won't help
+                    print(f"Can't fetch movie {movie_id}, it's skipped. Reason: {e}")
+                    stats.skipped += 1
+                except Exception as e:
+                    print(f"Can't fetch movie {movie_id}. Reason: {e}")
+                    stats.failed += 1
+
+            for language, language_items in items.items():
+                stats.fetched += catalog.save_movies(language_items, language=language)
+
+            stats.elapsed = time.monotonic() - started_at
+
+            if progress is not None:
+                progress(stats)
+
+    if not stats.failed:
+        CatalogSync.objects.update_or_create(
+            name=name,
+            defaults={'watermark': end}
+        )
+
+    stats.elapsed = time.monotonic() - started_at
+    return stats
@@ -0,0 +1,527 @@
+from concurrent.futures import wait
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+import requests
+from tmdbv3api.as_obj import AsObj
+from tmdbv3api.exceptions import TMDbException
+
+from . import catalog
+from .cache import ResponseCache, response_cache
+from .client import TMDBClient, get_client
+from .genres import GenresMap, genres_table
+from .prefix import prefix_index
+from .ranking import rank_movies
+from .records import MovieRecord
+from .search import search_catalog
+from ..utils import closing_connections, get_executor, modify_result
+
+__all__ = (
+    'ENDPOINTS',
+    'CATALOG_PAGE',
+    'MoviesPage',
+    'TMDBWrapper',
+    'get_cached_movies_genres'
+)
+
+ENDPOINTS = {
+    'popular': '/movie/popular',
+    'top_rated': '/movie/top_rated',
+    'upcoming': '/movie/upcoming',
+    'now_playing': '/movie/now_playing',
+    'search': '/search/movie',
+    'discover': '/discover/movie',
+    'genres': '/genre/movie/list',
+    'movie': '/movie/{movie_id}',
+}
+
+# Search page answered by the local catalog, TMDB pages follow it
+CATALOG_PAGE = 0
+
+# Endpoints those results are saved to the catalog
+CATALOG_ENDPOINTS = (
+    'popular',
+    'top_rated',
+    'upcoming',
+    'now_playing',
+    'search',
+    'discover',
+)
+
+# Endpoints those pages are saved to and read from the catalog, search pages
+# aren't: every query would leave its own pages
+CATALOG_PAGE_ENDPOINTS = (
+    'popular',
+    'top_rated',
+    'upcoming',
+    'now_playing',
+    'discover',
+)
+
+
+class MoviesPage(list):
+    """
+    Movies of a TMDB results page, aware of the page position.
+
+    Incomplete page lacks some of the requested pages,
+    it shouldn't be cached as a final result.
+    """
+    def __init__(
+            self,
+            movies: Iterable = (),
+            *,
+            page: int = 1,
+            total_pages: int = 1,
+            is_complete: bool = True
+    ):
+        super().__init__(movies)
+        self.page = page
+        self.total_pages = total_pages
+        self.is_complete = is_complete
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.total_pages
+
+
+def return_movies(movies: 'MoviesPage', profile: str = 'default') -> 'MoviesPage':
+    ranked = rank_movies(movies, profile=profile)
+    print('Movies count:', len(ranked))
+    return MoviesPage(
+        ranked,
+        page=movies.page,
+        total_pages=movies.total_pages,
+        is_complete=movies.is_complete
+    )
+
+
+def ranked(profile: str) -> Callable[['MoviesPage'], 'MoviesPage']:
+    """
+    Returns movies page modifier ranking it with the list type profile.
+    """
+    return partial(return_movies, profile=profile)
+
+
+def get_results(data: Dict, key: str = 'results') -> List['AsObj']:
+    return [AsObj(**item) for item in data[key]]
+
+
+def get_movies(data: Dict) -> List['MovieRecord']:
+    results = data['results']
+
+    # * fetched lists are cached with serialized records
+    if isinstance(results, bytes):
+        return MovieRecord.loads(results)
+
+    return [MovieRecord.from_dict(item) for item in results]
+
+
+def compact_page(data: Dict) -> Dict:
+    return {
+        'page': data.get('page', 1),
+        'total_pages': data.get('total_pages', 1),
+        'results': MovieRecord.dumps(get_movies(data)),
+    }
+
+
+def get_page(data: Dict) -> 'MoviesPage':
+    return MoviesPage(
+        get_movies(data),
+        page=data.get('page', 1),
+        total_pages=data.get('total_pages', 1)
+    )
+
+
+class TMDBWrapper:
+    """
+    Thin facade over the shared TMDB client and responses cache.
+
+    Cheap to construct: language given here is only a default for calls
+    made without explicit `language` argument.
+
+    With `use_catalog` every response fetched from TMDB fills the local
+    movies catalog. Movies lists and details are read through it while
+    they're fresh: lists within the endpoint TTL of the responses cache,
+    details within `TMDB_CATALOG_TTL`. Once TMDB fails outdated lists are
+    served and discovering falls back to filtering the catalog.
+    """
+    def __init__(
+            self,
+            language: str = None,
+            client: 'TMDBClient' = None,
+            cache: 'ResponseCache' = None,
+            use_catalog: bool = None
+    ):
+        self.language = language or settings.LANGUAGE_CODE
+        self.client = client or get_client()
+        self.cache = cache or response_cache
+        self.use_catalog = (
+            settings.TMDB_CATALOG_ENABLED
+            if use_catalog is None
+            else use_catalog
+        )
+
+    def set_language(self, language: str):
+        self.language = language
+
+    def get(self, endpoint: str, params: Dict = None, language: str = None) -> Dict:
+        language = language or self.language
+        params = params or {}
+
+        return self.cache.get_or_fetch(
+            endpoint=endpoint,
+            language=language,
+            params=params,
+            fetch=lambda: self.fetch(endpoint, params, language=language)
+        )
+
+    def fetch(self, endpoint: str, params: Dict = None, *, language: str, **kwargs) -> Dict:
+        reads_catalog = self.use_catalog and endpoint in CATALOG_PAGE_ENDPOINTS
+        ttl = settings.TMDB_CACHE_TTLS.get(endpoint)
+
+        if reads_catalog and ttl:
+            data = self.read_catalog(endpoint, params, language=language, ttl=ttl)
+
+            if data is not None:
+                return compact_page(data)
+
+        try:
+            data = self.client.get(
+                ENDPOINTS[endpoint].format(**kwargs),
+                params,
+                language=language
+            )
+        except (TMDbException, requests.RequestException) as e:
+            # * outdated list is better than none
+            data = self.read_catalog(endpoint, params, language=language) if reads_catalog else None
+
+            if data is None:
+                raise
+
+            print(f"Can't fetch {endpoint}, outdated catalog page is used. Reason: {e}")
+            return compact_page(data)
+
+        if self.use_catalog:
+            # * catalog writes don't delay the response
+            get_executor('tmdb-catalog', settings.TMDB_CATALOG_WRITE_WORKERS).submit(
+                closing_connections(self.save_to_catalog),
+                endpoint,
+                data,
+                params=params,
+                language=language
+            )
+
+        if endpoint in CATALOG_ENDPOINTS:
+            return compact_page(data)
+
+        return data
+
+    def read_catalog(
+            self,
+            endpoint: str,
+            params: Dict = None,
+            *,
+            language: str,
+            ttl: int = None
+    ) -> Optional[Dict]:
+        try:
+            return catalog.get_page(endpoint, params, language=language, ttl=ttl)
+        except Exception as e:
+            print(f"Can't read {endpoint} from catalog. Reason: {e}")
+            return None
+
+    def save_to_catalog(self, endpoint: str, data: Dict, *, params: Dict = None, language: str):
+        # * catalog is a secondary copy, its failure mustn't break browsing
+        try:
+            if endpoint in CATALOG_ENDPOINTS:
+                catalog.save_movies(data.get('results', []), language=language)
+
+            if endpoint in CATALOG_PAGE_ENDPOINTS:
+                catalog.save_page(endpoint, params, data, language=language)
+            if endpoint == 'movie':
+                catalog.save_movies([data], language=language)
+                catalog.save_genres(data.get('genres', []), language=language)
+            elif endpoint == 'genres':
+                catalog.save_genres(data.get('genres', []), language=language)
+        except Exception as e:
+            print(f"Can't save {endpoint} response to catalog. Reason: {e}")
+
+    def get_movie(self, movie_id: int, language: str = None) -> 'MovieRecord':
+        """
+        Returns movie details from the catalog, fetching them
+        from TMDB only if they're missing or outdated.
+        """
+        language = language or self.language
+
+        if self.use_catalog:
+            item = catalog.get_movie(movie_id, language=language)
+
+            if item is not None:
+                return MovieRecord.from_dict(item)
+
+        # * details aren't cached, but concurrent fetches are coalesced
+        return MovieRecord.from_dict(
+            self.cache.get_or_fetch(
+                endpoint='movie',
+                language=language,
+                params={'movie_id': movie_id},
+                fetch=lambda: self.fetch('movie', language=language, movie_id=movie_id)
+            )
+        )
+
+    @modify_result(ranked('popular'))
+    def popular(self, page: int = 1, language: str = None):
+        return get_page(
+            self.get('popular', {'page': page}, language=language)
+        )
+
+    @modify_result(ranked('top_rated'))
+    def top_rated(self, page: int = 1, language: str = None):
+        return get_page(
+            self.get('top_rated', {'page': page}, language=language)
+        )
+
+    @modify_result(ranked('upcoming'))
+    def upcoming(self, page: int = 1, region: str = 'UA', language: str = None):
+        return get_page(
+            self.get(
+                'upcoming',
+                {
+                    # "region": region,
+                    'page': page
+                },
+                language=language
+            )
+        )
+
+    @modify_result(ranked('now_playing'))
+    def now_playing(self, page: int = 1, language: str = None):
+        return get_page(
+            self.get('now_playing', {'page': page}, language=language)
+        )
+
+    def get_catalog_hits(self, query: str, language: str = None) -> List['MovieRecord']:
+        """
+        Returns movies found in the local catalog, or empty list
+        if there are too few of them.
+
+        Hits are cached like TMDB responses: the catalog gets movies
+        of fetched TMDB pages, so the same snapshot has to be used both
+        to show hits and to skip them on TMDB pages.
+        """
+        if not self.use_catalog:
+            return []
+
+        language = language or self.language
+
+        def fetch() -> Dict:
+            items = search_catalog(
+                query,
+                language=language,
+                limit=settings.TMDB_LOCAL_SEARCH_LIMIT
+            ) or []
+
+            if len(items) < settings.TMDB_LOCAL_SEARCH_MIN_RESULTS:
+                items = []
+
+            return {'results': MovieRecord.dumps(map(MovieRecord.from_dict, items))}
+
+        return get_movies(
+            self.cache.get_or_fetch(
+                endpoint='catalog_search',
+                language=language,
+                params={'query': query},
+                fetch=fetch
+            )
+        )
+
+    def search_catalog(self, query: str, language: str = None) -> Optional['MoviesPage']:
+        """
+        Returns movies found in the local catalog as the search page 0,
+        or `None` if there are too few of them and TMDB should be asked.
+
+        Catalog can't tell if TMDB has more, so the page always has the next
+        one: the following pages are TMDB ones, starting from the first.
+        """
+        movies = self.get_catalog_hits(query, language=language)
+
+        if not movies:
+            return None
+
+        return MoviesPage(movies, page=CATALOG_PAGE, total_pages=CATALOG_PAGE + 1)
+
+    def complete_movies(self, query: str, language: str = None, limit: int = 20) -> Optional['MoviesPage']:
+        """
+        Returns popular catalog movies with a title word starting with
+        the query, or `None` if the prefix index can't answer.
+        """
+        if not self.use_catalog:
+            return None
+
+        language = language or self.language
+        movie_ids = prefix_index.search(query, language=language, limit=limit)
+
+        if not movie_ids:
+            return None
+
+        items = catalog.get_movies(movie_ids, language=language, fresh=False)
+        return return_movies(
+            MoviesPage(
+                MovieRecord.from_dict(items[movie_id])
+                for movie_id in movie_ids
+                if movie_id in items
+            ),
+            profile='search'
+        )
+
+    @modify_result(ranked('search'))
+    def search_movies(self, query: str, page: int = CATALOG_PAGE, language: str = None, **kwargs):
+        """
+        Returns search page, a search starts from `CATALOG_PAGE`:
+        catalog hits if there are enough of them, otherwise TMDB page 1.
+        TMDB pages skip movies already shown with catalog hits.
+        """
+        if page == CATALOG_PAGE:
+            movies = self.search_catalog(query, language=language)
+
+            if movies is not None:
+                return movies
+
+            page = 1
+
+        movies = self.exclude_catalog_hits(
+            query,
+            self.search_movies_page(query, page=page, language=language),
+            language=language
+        )
+
+        # * TMDB page may consist of the shown catalog hits only
+        while not movies and movies.has_next:
+            movies = self.exclude_catalog_hits(
+                query,
+                self.search_movies_page(query, page=movies.page + 1, language=language),
+                language=language
+            )
+
+        return movies
+
+    def exclude_catalog_hits(self, query: str, movies: 'MoviesPage', language: str = None) -> 'MoviesPage':
+        shown = {movie.id for movie in self.get_catalog_hits(query, language=language)}
+        return MoviesPage(
+            [movie for movie in movies if movie.id not in shown],
+            page=movies.page,
+            total_pages=movies.total_pages
+        )
+
+    def search_movies_page(self, query: str, page: int = 1, language: str = None) -> 'MoviesPage':
+        """
+        Returns TMDB search page as is, without ranking.
+        """
+        return get_page(
+            self.get(
+                'search',
+                {'query': query, 'page': page},
+                language=language
+            )
+        )
+
+    def search_movies_pages(
+            self,
+            query: str,
+            pages: Iterable[int],
+            timeout: float,
+            language: str = None
+    ) -> 'MoviesPage':
+        """
+        Fetches search pages concurrently and returns movies of pages
+        arrived within `timeout`, deduplicated by movie id
+        and ranked all together.
+
+        Only the unbroken run of arrived pages is used and result `page` is
+        the last of them, so the next fetch continues from the first missing
+        one, the result is incomplete then. Late pages aren't cancelled: they still land in the responses cache.
+        Pages from `CATALOG_PAGE` are catalog hits alone, if there are enough
+        of them, otherwise TMDB pages from the first one.
+        """
+        pages = list(pages)
+
+        if pages and pages[0] == CATALOG_PAGE:
+            movies = self.search_catalog(query, language=language)
+
+            if movies is not None:
+                return return_movies(movies, profile='search')
+
+            # * no catalog step, the same amount of TMDB pages is fetched
+            pages = [page + 1 for page in pages]
+
+        executor = get_executor('tmdb-fetch', settings.TMDB_FETCH_WORKERS)
+        futures = [
+            executor.submit(
+                # * fetches may read the catalog
+                closing_connections(self.search_movies_page),
+                query=query,
+                page=page,
+                language=language
+            )
+            for page in pages
+        ]
+        done, _ = wait(futures, timeout=timeout)
+        movies = {}
+        last_page = pages[0] - 1 if pages else 0
+        total_pages = last_page
+        is_complete = True
+
+        for page, future in zip(pages, futures):
+            if future not in done or future.exception() is not None:
+                if future in done:
+                    print(f"Can't search movies. Reason: {future.exception()}")
+
+                # * the first missing page is still there to fetch
+                is_complete = False
+                total_pages = max(total_pages, page)
+                break
+
+            result = future.result()
+            last_page = page
+            total_pages = max(total_pages, result.total_pages)
+
+            for movie in self.exclude_catalog_hits(query, result, language=language):
+                movies.setdefault(movie.id, movie)
+
+        return return_movies(
+            MoviesPage(
+                list(movies.values()),
+                page=last_page,
+                total_pages=total_pages,
+                is_complete=is_complete
+            ),
+            profile='search'
+        )
+
+    @modify_result(ranked('discover'))
+    def discover_movies(self, params: Dict, language: str = None, **kwargs):
+        try:
+            data = self.get('discover', params, language=language)
+        except (TMDbException, requests.RequestException) as e:
+            if not self.use_catalog:
+                raise
+
+            print(f"Can't discover movies, catalog is used. Reason: {e}")
+            data = catalog.discover_movies(
+                params,
+                language=language or self.language
+            )
+
+        return get_page(data)
+
+    def get_movies_genres(self, language: str = None):
+        return get_results(
+            self.get('genres', language=language),
+            key='genres'
+        )
+
+
+def get_cached_movies_genres(language: str) -> 'GenresMap':
+    return genres_table.get(language)
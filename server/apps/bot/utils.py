@@ -1,8 +1,18 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from django.db import close_old_connections
 
 __all__ = (
     'modify_result',
-    'lookahead'
+    'lookahead',
+    'get_executor',
+    'closing_connections',
+    'PeriodicTask'
 )
 
 
@@ -38,3 +48,92 @@ def lookahead(iterable):
 
     # Report the last value.
     yield last, True
+
+
+def closing_connections(func: Callable) -> Callable:
+    """
+    Wraps function run by a pool thread, so database connections it opens
+    are closed once it's done instead of being leaked by the thread.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return wrapper
+
+
+_executors: Dict[str, Tuple[int, ThreadPoolExecutor]] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    Returns threads pool shared by the process under given name.
+
+    Pool is created lazily and recreated after fork (`gunicorn --preload`),
+    because threads of the parent process don't exist in a child.
+    """
+    pid = os.getpid()
+    entry = _executors.get(name)
+
+    if entry is None or entry[0] != pid:
+        with _executors_lock:
+            entry = _executors.get(name)
+
+            if entry is None or entry[0] != pid:
+                entry = (
+                    pid,
+                    ThreadPoolExecutor(
+                        max_workers=max_workers,
+                        thread_name_prefix=name
+                    )
+                )
+                _executors[name] = entry
+
+    return entry[1]
+
+
+class PeriodicTask:
+    """
+    Calls function every `interval` seconds in a daemon thread.
+
+    Thread is started lazily, once per process (see `get_executor`).
+    """
+    def __init__(self, func: Callable, interval: float, name: str):
+        self.func = func
+        self.interval = interval
+        self.name = name
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """
+        Starts thread unless it's running, returns if it's started now.
+        """
+        if self._pid == os.getpid():
+            return False
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return False
+
+            threading.Thread(
+                target=self._run,
+                name=self.name,
+                daemon=True
+            ).start()
+            self._pid = os.getpid()
+
+        return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+
+            try:
+                self.func()
+            except Exception as e:
+                print(f"Periodic task {self.name} failed. Reason: {e}")
@@ -1,9 +1,18 @@
+from queue import Full
+
+from django.conf import settings
+
+from django.http import Http404
+
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from .registry import registry
-from .services.webhook import process_webhook_event
+from .services.webhook import enqueue_webhook_event, process_webhook_event
+from .tmdb import response_cache
+from .workers import update_queue
 
 __all__ = (
     'WebhookView',
@@ -13,16 +22,40 @@ __all__ = (
 class WebhookView(APIView):
     permission_classes = (AllowAny,)
 
+    def get(self, request, *args, **kwargs):
+        """
+        Returns updates queue depth and throughput and TMDB cache counters.
+        """
+        if not registry.is_known(kwargs['token']):
+            raise Http404
+
+        return Response({
+            'queue': update_queue.stats(),
+            'tmdb_cache': response_cache.stats(),
+        })
+
     def post(self, request, *args, **kwargs):
         token: str = kwargs['token']
-        print('TOKEN:', token)
-        print('REGISTRY:', registry)
         dispatcher = registry.get_dispatcher(token)
-        print('DISPATCHER:', dispatcher)
-        dispatcher = process_webhook_event(
-            token=kwargs['token'],
-            request_body=request.data,
-            dispatcher=dispatcher
-        )
-        registry.register(dispatcher)
+
+        if dispatcher is None:
+            raise Http404
+
+        if settings.TELEGRAM_WEBHOOK_ASYNC:
+            try:
+                enqueue_webhook_event(
+                    token=kwargs['token'],
+                    request_body=request.data,
+                    dispatcher=dispatcher
+                )
+            except Full:
+                # Telegram will redeliver update later
+                return Response(status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        else:
+            process_webhook_event(
+                token=kwargs['token'],
+                request_body=request.data,
+                dispatcher=dispatcher
+            )
+
         return Response()
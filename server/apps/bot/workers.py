@@ -0,0 +1,213 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from queue import Full, Queue
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from django.conf import settings
+from django.db import close_old_connections
+
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import Dispatcher
+
+__all__ = (
+    'UpdateQueue',
+    'update_queue'
+)
+
+
+class UpdateQueue:
+    """
+    Bounded queue of webhook updates drained by a pool of worker threads.
+
+    Every worker owns its own queue and updates are sharded between them
+    by chat (or user), so updates of one conversation are still processed
+    one by one and in the order Telegram sent them.
+
+    Updates are acknowledged to Telegram once enqueued, so on exit
+    the queue stops accepting them and waits up to `drain_timeout`
+    seconds for the accepted ones to be processed.
+    """
+    def __init__(self, workers: int, maxsize: int, window: int = 60, drain_timeout: float = 10):
+        self.workers = max(workers, 1)
+        self.maxsize = max(maxsize, self.workers)
+        self.window = window
+        self.drain_timeout = drain_timeout
+        self.is_accepting = True
+        self.queues: List[Queue] = []
+        self.threads: List[threading.Thread] = []
+        self.started_at: Optional[float] = None
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._processed_at: deque = deque()
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        return str(self.stats())
+
+    def start(self):
+        """
+        Starts workers lazily, once per process.
+
+        Threads don't survive the fork made by `gunicorn --preload`,
+        that's why the pid is checked instead of a simple flag.
+        """
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+
+            size = self.maxsize // self.workers
+            self.queues = [Queue(maxsize=size) for _ in range(self.workers)]
+            self.threads = [
+                threading.Thread(
+                    target=self._work,
+                    args=(queue,),
+                    name=f'webhook-worker-{index}',
+                    daemon=True
+                )
+                for index, queue in enumerate(self.queues)
+            ]
+
+            for thread in self.threads:
+                thread.start()
+
+            self.started_at = time.monotonic()
+            self._pid = os.getpid()
+            atexit.register(self.drain)
+
+    def put(self, dispatcher: 'Dispatcher', update: 'Update'):
+        """
+        Enqueues update without blocking.
+
+        Raises `queue.Full` when the shard of the update is full or the queue
+        is drained on exit, so caller can ask Telegram to redeliver it later.
+        """
+        self.start()
+        queue = self.queues[self.get_shard(update)]
+
+        try:
+            if not self.is_accepting:
+                raise Full
+
+            queue.put_nowait((dispatcher, update))
+        except Full:
+            with self._lock:
+                self.rejected += 1
+            raise
+
+        with self._lock:
+            self.enqueued += 1
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Stops accepting updates and waits for accepted ones to be processed,
+        returns if all of them are.
+        """
+        self.is_accepting = False
+
+        if self._pid != os.getpid():
+            return True
+
+        timeout = self.drain_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        for queue in self.queues:
+            # * the condition shares the queue mutex, so the queue isn't
+            # * inspected by other means while it's held
+            with queue.all_tasks_done:
+                while queue.unfinished_tasks and time.monotonic() < deadline:
+                    queue.all_tasks_done.wait(deadline - time.monotonic())
+
+        lost = sum(queue.unfinished_tasks for queue in self.queues)
+
+        if lost:
+            print(f"Updates queue isn't drained in {timeout}s, {lost} updates are lost")
+
+        return not lost
+
+    def get_shard(self, update: 'Update') -> int:
+        if update.effective_chat is not None:
+            key = update.effective_chat.id
+        elif update.effective_user is not None:
+            key = update.effective_user.id
+        else:
+            key = update.update_id
+
+        return hash(key) % self.workers
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+
+        with self._lock:
+            self._trim(now)
+            recent = len(self._processed_at)
+            uptime = now - self.started_at if self.started_at else 0
+
+            return {
+                'workers': self.workers,
+                'alive_workers': sum(thread.is_alive() for thread in self.threads),
+                'depth': sum(queue.qsize() for queue in self.queues),
+                'depth_by_worker': [queue.qsize() for queue in self.queues],
+                'maxsize': self.maxsize,
+                'enqueued': self.enqueued,
+                'processed': self.processed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'accepting': self.is_accepting,
+                'uptime': round(uptime, 3),
+                'throughput': round(recent / min(self.window, uptime or 1), 3),
+                'throughput_window': self.window,
+            }
+
+    def _trim(self, now: float):
+        while self._processed_at and now - self._processed_at[0] > self.window:
+            self._processed_at.popleft()
+
+    def _work(self, queue: Queue):
+        # Avoid circular imports: webhook services import this module
+        from .services.webhook import process_update
+
+        while True:
+            dispatcher, update = queue.get()
+            close_old_connections()
+
+            try:
+                process_update(dispatcher=dispatcher, update=update)
+            except Exception as e:
+                print(f"Can't process update {update.update_id}. Reason: {e}")
+                success = False
+            else:
+                success = True
+            finally:
+                queue.task_done()
+                close_old_connections()
+
+            self._track(success)
+
+    def _track(self, success: bool):
+        now = time.monotonic()
+
+        with self._lock:
+            if success:
+                self.processed += 1
+            else:
+                self.failed += 1
+
+            self._processed_at.append(now)
+            self._trim(now)
+
+
+update_queue = UpdateQueue(
+    workers=settings.TELEGRAM_WEBHOOK_WORKERS,
+    maxsize=settings.TELEGRAM_WEBHOOK_QUEUE_SIZE,
+    drain_timeout=settings.TELEGRAM_WEBHOOK_DRAIN_TIMEOUT,
+)
@@ -0,0 +1,90 @@
+from typing import Dict, Iterable, List, Sequence, Type
+
+from django.db import NotSupportedError, connections, models, router
+from django.db.models.fields import AutoFieldMixin
+
+__all__ = (
+    'bulk_upsert',
+)
+
+# Max amount of query parameters SQLite accepts in old builds
+SQLITE_MAX_VARIABLES = 999
+
+
+def bulk_upsert(
+        model: Type[models.Model],
+        rows: Iterable[Dict],
+        *,
+        unique_fields: Sequence[str],
+        update_fields: Sequence[str],
+        batch_size: int = 1000
+) -> int:
+    """
+    Inserts rows or updates `update_fields` of existing ones
+    with `INSERT ... ON CONFLICT DO UPDATE` in batches.
+
+    Rows are dicts of model fields values, missing fields get their defaults.
+    There should be unique constraint over `unique_fields`.
+    Returns amount of affected rows.
+    """
+    connection = connections[router.db_for_write(model)]
+
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        raise NotSupportedError(
+            f'Upsert is not supported by {connection.vendor} database.'
+        )
+
+    opts = model._meta
+    # * primary key is inserted only if it isn't generated by the database
+    concrete_fields = [
+        field
+        for field in opts.concrete_fields
+        if not isinstance(field, AutoFieldMixin)
+    ]
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in concrete_fields)
+    conflict = ', '.join(
+        quote(opts.get_field(name).column)
+        for name in unique_fields
+    )
+    updates = ', '.join(
+        f'{quote(column)} = EXCLUDED.{quote(column)}'
+        for column in (opts.get_field(name).column for name in update_fields)
+    )
+    placeholders = f'({", ".join(["%s"] * len(concrete_fields))})'
+
+    if connection.vendor == 'sqlite':
+        batch_size = min(batch_size, SQLITE_MAX_VARIABLES // len(concrete_fields))
+
+    affected = 0
+    batch: List = []
+
+    def execute(batch: List) -> int:
+        sql = (
+            f'INSERT INTO {quote(opts.db_table)} ({columns}) '
+            f'VALUES {", ".join([placeholders] * len(batch))} '
+            f'ON CONFLICT ({conflict}) DO UPDATE SET {updates}'
+        )
+        params = [value for row in batch for value in row]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    for row in rows:
+        batch.append([
+            field.get_db_prep_save(
+                row[field.name] if field.name in row else field.get_default(),
+                connection
+            )
+            for field in concrete_fields
+        ])
+
+        if len(batch) >= batch_size:
+            affected += execute(batch)
+            batch = []
+
+    if batch:
+        affected += execute(batch)
+
+    return affected
@@ -1,12 +1,30 @@
+from typing import Dict
+
+from django.template import engines
 from jinja2 import Environment
 
+__all__ = (
+    'environment',
+    'render_template',
+)
+
 
 def environment(**options):
     """
     Provdes default environvent for jinja.
     """
-    options['cache_size'] = 0
-
     env = Environment(**options)
 
     return env
+
+
+def render_template(template_name: str, context: Dict = None) -> str:
+    """
+    Renders jinja template with given context only.
+
+    Unlike `render_to_string` it skips context processors and template
+    lookup through every engine. Compiled templates are kept
+    by the environment, so a template is compiled once per process.
+    """
+    template = engines['jinja2'].env.get_template(template_name)
+    return template.render(context or {})